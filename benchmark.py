@@ -0,0 +1,823 @@
+# benchmark.py
+"""네트워크 없이 실행하는 뉴스 봇 성능 벤치마크
+
+로컬 HTTP 서버가 합성 구글 뉴스 RSS와 기사 HTML을 제공하고, 가짜 Gemini 클라이언트가
+설정한 지연 시간으로 응답합니다. 이력(ALL.csv)은 지정한 크기로 생성합니다.
+
+    python benchmark.py run --sizes 1000 10000 100000 --output bench_new.json
+    python benchmark.py compare bench_old.json bench_new.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, unquote
+
+import pandas as pd
+
+import web_news
+
+# 실제 기사 제목처럼 어휘가 넓도록 한글 음절로 만든 합성 단어 사전
+_rng = random.Random(7)
+WORDS = ["".join(chr(0xAC00 + _rng.randrange(2350)) for _ in range(_rng.randint(2, 4))) for _ in range(3000)]
+SOURCES = ["연합뉴스", "KBS", "MBN", "매일경제", "뉴스1", "이데일리", "지역일보", "한국경제TV"]
+
+# ============== 합성 데이터 ==============
+def make_title(rng, keyword):
+    words = rng.sample(WORDS, rng.randint(4, 8))
+    words.insert(rng.randint(0, len(words)), keyword)
+    return " ".join(words) + f" - {rng.choice(SOURCES)}"
+
+def make_history(size, keywords, seed=0):
+    """지정한 크기의 ALL.csv 이력 DataFrame 생성"""
+    rng = random.Random(seed)
+    start = pd.Timestamp("2024-01-01 08:00")
+    rows = []
+    for i in range(size):
+        keyword = rng.choice(keywords)
+        title = make_title(rng, keyword) + f" {i}"
+        collected = (start + pd.Timedelta(minutes=37 * i)).strftime("%Y-%m-%d %H:%M")
+        rows.append({
+            "키워드": keyword, "관련키워드": keyword, "제목": title, "출처": rng.choice(SOURCES),
+            "요약": "- 가\n- 나\n- 다", "원문링크": f"https://news.example/{i}", "실제링크": "",
+            "발행일(KST)": collected, "수집시각(KST)": collected,
+        })
+    df = pd.DataFrame(rows)
+    df["_title_norm"] = web_news.normalize_titles(df["제목"], keywords)
+    return df
+
+def make_article_html(keyword, seed):
+    rng = random.Random(seed)
+    paragraphs = "".join(
+        f"<p>{keyword} {' '.join(rng.sample(WORDS, 12))}. 관계자는 이번 조치가 현장에 도움이 될 것이라고 밝혔다.</p>"
+        for _ in range(8)
+    )
+    return (
+        "<html><head><title>기사</title></head><body>"
+        "<nav>메뉴 | 로그인 | 구독</nav>"
+        f"<article><h1>{keyword} 기사</h1>{paragraphs}</article>"
+        "<footer>Copyright 뉴스</footer></body></html>"
+    )
+
+class FeedServer:
+    """합성 RSS(/rss?q=...)와 기사 페이지(/art/<키워드>/<n>)를 제공하는 로컬 HTTP 서버"""
+
+    def __init__(self, items_per_feed=20, latency=0.0):
+        self.items_per_feed = items_per_feed
+        self.latency = latency
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                url = urlparse(self.path)
+                if url.path.startswith("/rss"):
+                    keyword = unquote(parse_qs(url.query)["q"][0]).split(" ")[0]
+                    body = server.feed(keyword).encode("utf-8")
+                    content_type = "application/rss+xml; charset=utf-8"
+                else:
+                    _, _, keyword, n = unquote(url.path).split("/")
+                    body = make_article_html(keyword, n).encode("utf-8")
+                    content_type = "text/html; charset=utf-8"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def feed(self, keyword):
+        rng = random.Random(keyword)
+        items = []
+        for i in range(self.items_per_feed):
+            source = rng.choice(SOURCES)
+            items.append(
+                f"<item><title>{make_title(rng, keyword)}</title>"
+                f"<link>{self.base}/art/{keyword}/{i}</link><guid>{keyword}-{i}</guid>"
+                f"<pubDate>Mon, 09 Feb 2026 {i % 24:02d}:00:00 GMT</pubDate>"
+                f"<source>{source}</source></item>"
+            )
+        return f"<?xml version='1.0' encoding='UTF-8'?><rss><channel>{''.join(items)}</channel></rss>"
+
+    def close(self):
+        self.httpd.shutdown()
+
+class FakeGeminiClient:
+    """지연 시간을 설정할 수 있는 가짜 Gemini 클라이언트 (프롬프트 종류별 응답 형식 흉내)
+
+    batch_reply(기사 수)를 주면 배치 요약 요청에 그 반환 문자열로 응답합니다 (잘못된 응답 흉내).
+    """
+
+    def __init__(self, latency=0.0, batch_reply=None):
+        self.latency = latency
+        self.batch_reply = batch_reply
+        self.calls = 0
+        self.models = self
+
+    def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        count = contents.count("[기사 ")
+        if count and self.batch_reply:
+            text = self.batch_reply(count)
+        elif count:
+            text = json.dumps([{"id": i + 1, "summary": ["가", "나", "다"]} for i in range(count)])
+        elif "뉴스 제목 리스트" in contents:
+            text = ", ".join(re.findall(r"^(\d+)\.", contents, re.M))
+        else:
+            text = "- 가\n- 나\n- 다"
+        return type("Response", (), {"text": text})()
+
+class FakeClock:
+    """sleep()이 실제로 기다리지 않고 시각만 앞당기는 가짜 시계 (API 속도 제한 대기 생략용)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += seconds
+
+class AuthSmtpServer:
+    """AUTH를 광고하고 로그인 전 MAIL FROM을 530으로 거부하는 최소 SMTP 서버 (STARTTLS 없음)"""
+
+    def __init__(self):
+        self.delivered = []
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self):
+                authed = False
+                self.reply("220 stub ESMTP")
+                for raw in self.rfile:
+                    command = raw.decode().strip()
+                    verb = command.split(" ")[0].upper()
+                    if verb == "EHLO":
+                        self.reply("250-stub")
+                        self.reply("250 AUTH PLAIN")
+                    elif verb == "AUTH":
+                        authed = True
+                        self.reply("235 Authentication successful")
+                    elif verb == "MAIL":
+                        self.reply("250 OK" if authed else "530 Authentication Required")
+                    elif verb == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        for line in self.rfile:
+                            if line == b".\r\n":
+                                break
+                        server.delivered.append(command)
+                        self.reply("250 OK")
+                    elif verb == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        self.reply("250 OK")
+
+        self.tcp = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.tcp.daemon_threads = True
+        self.port = self.tcp.server_address[1]
+        threading.Thread(target=self.tcp.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.tcp.shutdown()
+        self.tcp.server_close()
+
+# 프로세스 시작 ~ CLI 응답까지 허용하는 최대 시간(초) (무거운 라이브러리는 실제 사용하는 단계에서만 import)
+STARTUP_LIMIT_SEC = 0.5
+
+# ============== 측정 ==============
+def measure(func, items):
+    """items 각각에 func를 실행하여 처리량과 지연 시간 분포 계산"""
+    latencies = []
+    started = time.perf_counter()
+    for item in items:
+        t = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - t)
+    total = time.perf_counter() - started
+    return summarize(len(items), total, latencies)
+
+def summarize(count, total, latencies=None):
+    result = {
+        "count": count,
+        "total_s": round(total, 4),
+        "throughput_per_s": round(count / total, 2) if total > 0 else None,
+    }
+    if latencies:
+        latencies = sorted(latencies)
+        result["p50_ms"] = round(statistics.median(latencies) * 1000, 4)
+        result["p95_ms"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 4)
+    return result
+
+def bench_startup(runs=5):
+    """새 프로세스에서 import / --help 까지 걸리는 시간 (여러 번 실행한 최솟값)"""
+    script = Path(web_news.__file__).resolve()
+    commands = {
+        "import": [sys.executable, "-c", "import web_news"],
+        "cli_help": [sys.executable, str(script), "--help"],
+    }
+    results = {}
+    for name, command in commands.items():
+        timings = []
+        for _ in range(runs):
+            t = time.perf_counter()
+            subprocess.run(command, cwd=script.parent, stdout=subprocess.DEVNULL, check=True)
+            timings.append(time.perf_counter() - t)
+        results[name] = {**summarize(runs, sum(timings), timings), "min_s": round(min(timings), 4)}
+    return results
+
+def check_startup(results, limit=STARTUP_LIMIT_SEC):
+    """시작 시간이 limit을 넘는 항목 목록"""
+    return [name for name, value in results.items() if value["min_s"] > limit]
+
+def bench_normalize(history):
+    titles = list(history["제목"])
+    return measure(web_news.normalize_title, titles)
+
+def bench_normalize_batch(history, keywords):
+    """제목 컬럼 전체 정규화: 행별 normalize_title + strip_keywords vs normalize_titles"""
+    titles = list(history["제목"])
+    started = time.perf_counter()
+    expected = [web_news.strip_keywords(web_news.normalize_title(t), keywords) for t in titles]
+    results = {"per_row": summarize(len(titles), time.perf_counter() - started)}
+    started = time.perf_counter()
+    batch = web_news.normalize_titles(history["제목"], keywords)
+    results["batch"] = summarize(len(titles), time.perf_counter() - started)
+    results["batch"]["matches_per_row"] = batch.tolist() == expected
+    return results
+
+def bench_source_score(history):
+    pairs = list(zip(history["원문링크"], history["제목"]))
+    return measure(lambda p: web_news.get_source_score(*p), pairs)
+
+def bench_dedup(history, queries, threshold, brute_force_limit):
+    """제목 색인 구축/조회와 (작은 이력에서) 기존 전체 비교 방식 측정"""
+    titles = list(history["_title_norm"])
+    urls = list(history["원문링크"])
+    started = time.perf_counter()
+    index = web_news.TitleIndex.build(titles, urls)
+    results = {"index_build": summarize(len(titles), time.perf_counter() - started)}
+    results["index_query"] = measure(lambda q: index.find_similar(q, threshold), queries)
+    if len(titles) <= brute_force_limit:
+        results["brute_force_query"] = measure(
+            lambda q: any(web_news.is_similar_title(q, t, threshold) for t in titles), queries)
+    return results
+
+def bench_extraction(server, keywords, pages):
+    urls = [f"{server.base}/art/{keywords[i % len(keywords)]}/{i}" for i in range(pages)]
+    single = measure(web_news.extract_article_content, urls[: max(1, pages // 4)])
+    started = time.perf_counter()
+    web_news.extract_articles(urls)
+    return {"sequential": single, "parallel": summarize(len(urls), time.perf_counter() - started)}
+
+def bench_presummary(keywords, pages):
+    """요약 전 발췌(compact_article) 처리 시간과 프롬프트 토큰 감소량"""
+    articles = [(keywords[i % len(keywords)], web_news.extract_text_from_html(
+        make_article_html(keywords[i % len(keywords)], i))) for i in range(pages)]
+    result = measure(lambda item: web_news.compact_article(item[1], [item[0]], f"{item[0]} 기사"), articles)
+    before = sum(web_news.estimate_tokens(text[:web_news.SUMMARY_CHAR_LIMIT]) for _, text in articles)
+    after = sum(web_news.estimate_tokens(web_news.compact_article(text, [kw], f"{kw} 기사")) for kw, text in articles)
+    result.update(tokens_before=before, tokens_after=after)
+    return result
+
+def bench_email(history, receivers=300):
+    """수신자별 구독 리포트 조립 시간 (최근 기사 100건, 구독 조합 4종)"""
+    keywords = sorted(history["키워드"].unique())
+    rows = history.tail(100).assign(관련키워드=lambda df: df["키워드"], 신뢰도=70).to_dict("records")
+    combos = [None, keywords[:1], keywords[1:2], keywords[:2]]
+    subscriptions = {f"user{i}@example.com": combos[i % len(combos)] for i in range(receivers)}
+    started = time.perf_counter()
+    digests = web_news.build_digests(rows, keywords, {}, subscriptions, "2026-01-01")
+    result = summarize(receivers, time.perf_counter() - started)
+    result["digests"] = len(digests)
+    return result
+
+def bench_trend(history, weeks=4):
+    """주간 추이: 일별 집계 조회 vs 전체 이력 집계 (집계 생성 시간 포함)"""
+    stats = web_news.DailyStats(Path(tempfile.mkdtemp(prefix="news_stats_")) / "aggregates.sqlite3")
+    history = history.assign(신뢰도=70)
+    started = time.perf_counter()
+    stats.add(history)
+    results = {"materialize": summarize(len(history), time.perf_counter() - started)}
+    since = (pd.Timestamp(history["수집시각(KST)"].max()) - pd.Timedelta(weeks=weeks)).strftime("%Y-%m-%d")
+    results["query_materialized"] = measure(
+        lambda _: web_news.weekly_trend(stats.read(since), None, weeks), range(5))
+    results["query_full_history"] = measure(
+        lambda _: web_news.weekly_trend(web_news.DailyStats.rollup(history), None, weeks), range(5))
+    return results
+
+def bench_end_to_end(server, history, gemini_latency):
+    """임시 디렉터리에서 main()을 두 번 실행 (첫 실행: 이력 이전 + 신규 처리, 두 번째: 신규 없음)
+
+    속도 제한 대기는 건너뛰고, 파이프라인 출력은 버립니다.
+    """
+    workdir = tempfile.mkdtemp(prefix="news_bench_")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    results = {}
+    try:
+        Path("data").mkdir()
+        history[web_news.DISPLAY_COLS].to_csv("data/ALL.csv", index=False, encoding="utf-8-sig")
+        for cache in web_news._caches.values():
+            cache.close()
+        web_news._caches.clear()
+        # 수집 기준점도 작업 디렉터리별 상태이므로 이전 크기의 기준점을 버림 (그대로 두면 0건 수집)
+        web_news._feed_state = None
+        for name in ("cold", "warm"):
+            client = FakeGeminiClient(gemini_latency)
+            web_news._gemini_client = client
+            started = time.perf_counter()
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                web_news.main()
+            result = summarize(1, time.perf_counter() - started)
+            result["stages"] = web_news.METRICS.to_dict()["stages"]
+            result["gemini_calls"] = client.calls
+            results[name] = result
+    finally:
+        os.chdir(cwd)
+    return results
+
+# ============== 동작 검사 ==============
+def check_smtp_auth():
+    """AUTH를 요구하는 서버에서 로그인 후 모든 수신자에게 발송되는지"""
+    server = AuthSmtpServer()
+    settings = (web_news.SMTP_HOST, web_news.SMTP_PORT, web_news.SMTP_STARTTLS, web_news.EMAIL_USER, web_news.EMAIL_PASSWORD)
+    web_news.SMTP_HOST, web_news.SMTP_PORT, web_news.SMTP_STARTTLS = "127.0.0.1", server.port, False
+    web_news.EMAIL_USER, web_news.EMAIL_PASSWORD = "bot@example.com", "secret"
+    try:
+        messages = [(f"user{i}@example.com", "Subject: t\r\n\r\nbody") for i in range(3)]
+        sent = web_news.send_messages(messages)
+    finally:
+        (web_news.SMTP_HOST, web_news.SMTP_PORT, web_news.SMTP_STARTTLS,
+         web_news.EMAIL_USER, web_news.EMAIL_PASSWORD) = settings
+        server.close()
+    assert sent == 3 and len(server.delivered) == 3, f"발송 {sent}건, 서버 수신 {len(server.delivered)}건"
+
+def check_html_charset():
+    """charset을 HTTP 헤더에만 적은 CP949 페이지도 사전 필터를 통과하는지"""
+    body = "<html><body>일학습병행 확대 기사</body></html>".encode("cp949")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=EUC-KR")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    mode = web_news.HTTP_CACHE_MODE
+    web_news.HTTP_CACHE_MODE = "off"
+    try:
+        html, charset = web_news.fetch_html(f"http://127.0.0.1:{httpd.server_port}/article")
+    finally:
+        web_news.HTTP_CACHE_MODE = mode
+        httpd.shutdown()
+    assert charset and charset.lower() == "euc-kr", f"헤더 charset: {charset}"
+    assert web_news.html_mentions(html, ["일학습병행"], charset=charset), "헤더 charset 무시"
+    assert web_news.html_mentions(body, ["일학습병행"]), "charset 선언 없는 CP949 페이지 제외"
+    assert not web_news.html_mentions(body, ["한미약품"]), "키워드 없는 페이지 통과"
+
+def check_normalize_titles():
+    """normalize_titles(컬럼 일괄)가 수집 때 쓰는 행별 normalize_title + strip_keywords와 같은지
+
+    NBSP/전각 공백 등 ASCII가 아닌 공백과 공백이 든 키워드를 포함 (pyarrow가 있으면 RE2 경로 검사)
+    """
+    keywords = ["일학습병행", "산업 인력", "C++"]
+    titles = [
+        "일학습병행\u00a0확대\u3000발표 - 연합뉴스",
+        "\u3000[단독] 산업 인력 공단,\u2009일학습병행 (종합)\u00a0",
+        "C++ 개발자\u202f양성 … 「직업훈련」 \u200a확대\n",
+        "(사진) 한국산업인력공단\u2028원장 [포토]",
+        "",
+    ] + list(make_history(200, ["일학습병행", "직업훈련"])["제목"])
+    expected = [web_news.strip_keywords(web_news.normalize_title(t), keywords) for t in titles]
+    series = [pd.Series(titles, dtype=object)]
+    try:
+        import pyarrow  # noqa: F401
+        series.append(pd.Series(titles, dtype="string[pyarrow]"))
+    except ImportError:
+        pass
+    for column in series:
+        batch = web_news.normalize_titles(column, keywords).tolist()
+        mismatches = [(t, b, e) for t, b, e in zip(titles, batch, expected) if b != e]
+        assert not mismatches, f"{column.dtype}: {mismatches[:3]}"
+
+def check_source_tiers():
+    """출처명 접미어(KBS뉴스)는 같은 언론사로, 자회사 하위 도메인은 본사와 다른 출처로 판별하는지"""
+    resolver = web_news.SourceResolver.from_config({})
+    cases = {
+        ("", "KBS뉴스"): (95, "KBS"), ("", "MBC뉴스"): (95, "MBC"), ("", "연합뉴스TV"): (100, "연합뉴스TV"),
+        ("", "한국경제TV"): (50, "기타"), ("", "조선비즈"): (50, "기타"),
+        ("https://www.chosun.com/a", ""): (85, "조선일보"), ("https://news.kbs.co.kr/a", ""): (95, "KBS"),
+        ("https://biz.chosun.com/a", ""): (50, "기타"), ("https://sports.chosun.com/a", ""): (50, "기타"),
+        ("https://sports.donga.com/a", ""): (50, "기타"),
+    }
+    wrong = {case: resolver.resolve(*case) for case, expected in cases.items() if resolver.resolve(*case) != expected}
+    assert not wrong, f"잘못 판별: {wrong}"
+
+TITLE_INDEX_THRESHOLDS = (0.3, 0.4, 0.5, 0.6, 0.7)
+
+def title_variants(title, rng, count=6):
+    """정규화된 제목의 변형 (단어 삭제/추가/순서 변경/글자 치환) — 비슷한 기사와 다른 기사의 경계 사례"""
+    words = title.split()
+    variants = []
+    for _ in range(count):
+        changed = list(words)
+        edit = rng.randrange(5)
+        if edit == 4:
+            # 단어 절반 가까이를 바꿔 임계값 근처의 사례를 만듦
+            for i in rng.sample(range(len(changed)), len(changed) // 2):
+                changed[i] = rng.choice(WORDS)
+        elif edit == 0 and len(changed) > 1:
+            changed.pop(rng.randrange(len(changed)))
+        elif edit == 1:
+            changed.insert(rng.randint(0, len(changed)), rng.choice(WORDS))
+        elif edit == 2:
+            rng.shuffle(changed)
+        elif changed:
+            i = rng.randrange(len(changed))
+            changed[i] = rng.choice(WORDS)[:1] + changed[i][1:]
+        variants.append(" ".join(changed))
+    return variants
+
+def check_title_index():
+    """TitleIndex가 전체 비교(is_similar_title)와 같은 중복 판정을 내리는지 (ALL.csv 제목 + 변형, 여러 임계값)"""
+    rng = random.Random(3)
+    all_csv = Path(web_news.__file__).resolve().parent / "data" / "ALL.csv"
+    history = list(pd.read_csv(all_csv, dtype=str, encoding="utf-8-sig")["_title_norm"].dropna()) if all_csv.exists() else []
+    history += list(make_history(150, ["일학습병행", "직업훈련"])["_title_norm"])
+    index = web_news.TitleIndex.build(history, [])
+    queries = [variant for title in history[:80] for variant in title_variants(title, rng)]
+    queries += list(make_history(60, ["고용노동부"], seed=1)["_title_norm"])
+    mismatches = []
+    for threshold in TITLE_INDEX_THRESHOLDS:
+        for query in queries:
+            expected = any(web_news.is_similar_title(query, title, threshold) for title in history)
+            if (index.find_similar(query, threshold) is not None) != expected:
+                mismatches.append((threshold, query, expected))
+    assert not mismatches, f"{len(mismatches)}건 불일치: {mismatches[:3]}"
+
+def check_collect_order():
+    """병렬 RSS 수집(workers > 1)이 응답 순서와 무관하게 키워드 순서를 지키고, 호스트별 동시 연결 수 제한을 지키는지"""
+    keywords = ["일학습병행", "직업훈련", "고용노동부", "산업인력", "국가기술자격", "평생학습"]
+    delays = {kw: 0.05 * (len(keywords) - i) for i, kw in enumerate(keywords)}  # 앞 키워드일수록 늦게 응답
+    lock = threading.Lock()
+    active = [0, 0]  # 현재 동시 요청 수, 최댓값
+
+    class SlowFeedServer(FeedServer):
+        def feed(self, keyword):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(delays.get(keyword, 0))
+            with lock:
+                active[0] -= 1
+            return super().feed(keyword)
+
+    server = SlowFeedServer(items_per_feed=5)
+    saved = (web_news.GOOGLE_NEWS_RSS_BASE, web_news.HTTP_CACHE_MODE, web_news.INCREMENTAL,
+             web_news.PER_HOST_LIMIT, dict(web_news._host_semaphores))
+    web_news.GOOGLE_NEWS_RSS_BASE = f"{server.base}/rss"
+    web_news.HTTP_CACHE_MODE = "off"
+    web_news.INCREMENTAL = False
+    web_news.PER_HOST_LIMIT = 2
+    web_news._host_semaphores.clear()
+    try:
+        parallel = web_news.collect_news(keywords, "2026-02-09", workers=len(keywords))
+        peak = active[1]
+        sequential = web_news.collect_news(keywords, "2026-02-09", workers=1)
+    finally:
+        (web_news.GOOGLE_NEWS_RSS_BASE, web_news.HTTP_CACHE_MODE, web_news.INCREMENTAL,
+         web_news.PER_HOST_LIMIT, semaphores) = saved
+        web_news._host_semaphores.clear()
+        web_news._host_semaphores.update(semaphores)
+        server.close()
+    order = list(dict.fromkeys(row["키워드"] for row in parallel))
+    assert order == keywords, f"키워드 순서: {order}"
+    assert parallel == sequential, "병렬 수집 결과가 순차 수집과 다름"
+    assert 1 < peak <= 2, f"호스트별 최대 동시 요청 수: {peak} (제한 2)"
+
+
+class ApiError(Exception):
+    """HTTP 상태 코드(code)를 가진 가짜 API 오류"""
+
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def check_rate_scheduler():
+    """RateScheduler가 RPM/TPM 할당량, 429/5xx 백오프 재시도, 서킷 브레이커 열림/닫힘을 지키는지 (가짜 시계)"""
+    # RPM/TPM: 어느 구간에서든 요청(토큰) 수가 버킷 크기 + 구간 동안 채워진 양을 넘지 않음
+    for rpm, tpm, tokens in ((60, None, 0), (None, 1000, 400)):
+        clock = FakeClock()
+        scheduler = web_news.RateScheduler(rpm, tpm, clock=clock.time, sleep=clock.sleep)
+        stamps = []
+        for _ in range(100):
+            scheduler.call(lambda: stamps.append(clock.now), tokens=tokens)
+        limit, cost = (rpm, 1) if rpm else (tpm, tokens)
+        for i in range(len(stamps)):
+            for j in range(i, len(stamps)):
+                used = (j - i + 1) * cost
+                assert used <= limit + (stamps[j] - stamps[i]) * limit / 60 + 1e-6, \
+                    f"할당량 초과: {used} ({stamps[i]:.1f}~{stamps[j]:.1f}초, rpm={rpm}, tpm={tpm})"
+        expected = (100 * cost - limit) * 60 / limit
+        assert abs(clock.now - expected) < 1e-6, f"대기 시간 {clock.now:.1f}초 (예상 {expected:.1f}초)"
+
+    # 재시도: 429/5xx는 지수 백오프(지터 0 → delay/2) 후 재시도, 그 밖의 오류는 바로 전달
+    clock = FakeClock()
+    scheduler = web_news.RateScheduler(None, max_retries=3, base_delay=2.0, clock=clock.time,
+                                       sleep=clock.sleep, rng=lambda: 0.0)
+    errors = [ApiError(429), ApiError(503)]
+    attempts = []
+
+    def flaky():
+        attempts.append(clock.now)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert scheduler.call(flaky) == "ok", "재시도 후 결과 없음"
+    assert attempts == [0.0, 1.0, 3.0], f"재시도 시각: {attempts}"
+    for code, expected_attempts in ((400, 1), (500, 4)):
+        attempts.clear()
+
+        def failing(code=code):
+            attempts.append(clock.now)
+            raise ApiError(code)
+
+        try:
+            scheduler.call(failing)
+        except ApiError:
+            pass
+        else:
+            raise AssertionError(f"HTTP {code} 오류가 전달되지 않음")
+        assert len(attempts) == expected_attempts, f"HTTP {code} 시도 횟수: {len(attempts)}"
+
+    # 서킷 브레이커: 연속 실패 threshold번이면 열리고, 쿨다운 뒤 시험 호출 결과로 닫히거나 다시 열림
+    clock = FakeClock()
+    scheduler = web_news.RateScheduler(None, max_retries=0, breaker_threshold=3, breaker_cooldown=120.0,
+                                       clock=clock.time, sleep=clock.sleep)
+    calls = []
+
+    def down():
+        calls.append(clock.now)
+        raise ApiError(503)
+
+    for _ in range(3):
+        try:
+            scheduler.call(down)
+        except ApiError:
+            pass
+    assert scheduler.is_open(), "연속 실패 후 서킷이 열리지 않음"
+    try:
+        scheduler.call(down)
+    except web_news.CircuitOpenError:
+        pass
+    else:
+        raise AssertionError("서킷이 열렸는데 호출됨")
+    assert len(calls) == 3, f"서킷이 열린 뒤 호출 수: {len(calls)}"
+    clock.sleep(120.0)
+    assert not scheduler.is_open(), "쿨다운 후에도 서킷이 열려 있음"
+    try:
+        scheduler.call(down)
+    except ApiError:
+        pass
+    assert scheduler.is_open(), "쿨다운 뒤 시험 호출이 실패했는데 서킷이 다시 열리지 않음"
+    clock.sleep(120.0)
+    assert scheduler.call(lambda: "ok") == "ok", "쿨다운 뒤 시험 호출 실패"
+    assert not scheduler.is_open() and scheduler.failures == 0, "성공한 뒤에도 서킷이 닫히지 않음"
+
+
+def check_batch_summaries():
+    """배치 요약 응답이 깨졌거나 일부 기사가 빠졌을 때 해석 가능한 항목만 쓰고 나머지는 개별 요약으로 대체하는지"""
+    bullets = ["가", "나", "다"]
+    parsed = web_news.parse_batch_summaries("```json\n" + json.dumps({"summaries": [
+        {"id": 1, "summary": bullets},
+        {"id": "2", "summary": ["- 하나", "둘", "셋", ""]},
+        {"id": 3, "summary": ["둘뿐", "문장"]},
+        {"id": 9, "summary": bullets},
+        {"id": None, "summary": bullets},
+        "문자열",
+    ]}, ensure_ascii=False) + "\n```", 4)
+    assert parsed == {1: "- 가\n- 나\n- 다", 2: "- 하나\n- 둘\n- 셋"}, f"해석 결과: {parsed}"
+    try:
+        web_news.parse_batch_summaries("[{\"id\": 1, ", 1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("잘린 JSON이 예외 없이 해석됨")
+
+    texts = [f"일학습병행 기사 {i} 본문입니다. " * 5 for i in range(4)]
+    batch_summary = "- 배치 1\n- 배치 2\n- 배치 3"
+    partial = json.dumps([{"id": 1, "summary": ["배치 1", "배치 2", "배치 3"]},
+                          {"id": 2, "summary": ["배치 1"]},
+                          {"id": 3, "summary": ["배치 1", "배치 2", "배치 3"]}], ensure_ascii=False)
+    cases = (
+        ("잘린 JSON", lambda count: '[{"id": 1, "summary": ["배치', [False] * 4),
+        ("JSON 아님", lambda count: "요약을 생성할 수 없습니다", [False] * 4),
+        ("일부 누락", lambda count: partial, [True, False, True, False]),
+    )
+    saved = (web_news._gemini_client, web_news.GEMINI_SCHEDULER, web_news.HTTP_CACHE_MODE,
+             web_news.SUMMARY_MODE, web_news.SUMMARY_BATCH_SIZE, web_news.SUMMARY_BATCH_TOKEN_BUDGET,
+             web_news.GEMINI_CONCURRENCY)
+    clock = FakeClock()
+    web_news.GEMINI_SCHEDULER = web_news.RateScheduler(None, clock=clock.time, sleep=clock.sleep)
+    web_news.HTTP_CACHE_MODE = "off"
+    web_news.SUMMARY_MODE = "batch"
+    web_news.SUMMARY_BATCH_SIZE = len(texts)
+    web_news.SUMMARY_BATCH_TOKEN_BUDGET = 100000
+    web_news.GEMINI_CONCURRENCY = 1
+    try:
+        for name, reply, from_batch in cases:
+            client = FakeGeminiClient(batch_reply=reply)
+            web_news._gemini_client = client
+            summaries = web_news.summarize_articles(texts)
+            expected = [batch_summary if ok else "- 가\n- 나\n- 다" for ok in from_batch]
+            assert summaries == expected, f"{name}: {summaries}"
+            assert client.calls == 1 + from_batch.count(False), f"{name}: API 호출 {client.calls}회"
+    finally:
+        (web_news._gemini_client, web_news.GEMINI_SCHEDULER, web_news.HTTP_CACHE_MODE, web_news.SUMMARY_MODE,
+         web_news.SUMMARY_BATCH_SIZE, web_news.SUMMARY_BATCH_TOKEN_BUDGET, web_news.GEMINI_CONCURRENCY) = saved
+
+
+CHECKS = {
+    "smtp_auth": check_smtp_auth,
+    "html_charset": check_html_charset,
+    "normalize_titles": check_normalize_titles,
+    "source_tiers": check_source_tiers,
+    "title_index": check_title_index,
+    "collect_order": check_collect_order,
+    "rate_scheduler": check_rate_scheduler,
+    "batch_summaries": check_batch_summaries,
+}
+
+def run_checks(names=None):
+    """동작 검사 실행, 실패한 검사 이름 목록 반환"""
+    web_news.configure()
+    failed = []
+    for name in names or CHECKS:
+        try:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                CHECKS[name]()
+            print(f"[OK] {name}")
+        except AssertionError as e:
+            print(f"[FAIL] {name}: {e}")
+            failed.append(name)
+    return failed
+
+def run_benchmarks(args):
+    web_news.configure()
+    keywords = web_news.KEYWORDS or ["일학습병행"]
+    rng = random.Random(42)
+    queries = [web_news.normalize_title(make_title(rng, rng.choice(keywords))) for _ in range(args.queries)]
+    server = FeedServer(items_per_feed=args.items_per_feed, latency=args.http_latency)
+    web_news.GOOGLE_NEWS_RSS_BASE = f"{server.base}/rss"
+    web_news.rate_limit_sleep = lambda seconds: None
+    clock = FakeClock()
+    web_news.GEMINI_SCHEDULER = web_news.RateScheduler(
+        web_news.GEMINI_RPM, web_news.GEMINI_TPM, clock=clock.time, sleep=clock.sleep
+    )
+
+    results = {f"startup/{name}": value for name, value in bench_startup().items()}
+    try:
+        for size in args.sizes:
+            history = make_history(size, keywords)
+            prefix = f"history_{size}"
+            results[f"{prefix}/normalize_title"] = bench_normalize(history)
+            for name, value in bench_normalize_batch(history, keywords).items():
+                results[f"{prefix}/normalize_{name}"] = value
+            results[f"{prefix}/get_source_score"] = bench_source_score(history)
+            for name, value in bench_dedup(history, queries, web_news.SIMILARITY_THRESHOLD,
+                                           args.brute_force_limit).items():
+                results[f"{prefix}/dedup_{name}"] = value
+            results[f"{prefix}/email_digests"] = bench_email(history)
+            for name, value in bench_trend(history).items():
+                results[f"{prefix}/trend_{name}"] = value
+            if not args.skip_e2e:
+                for name, value in bench_end_to_end(server, history, args.gemini_latency).items():
+                    results[f"{prefix}/main_{name}"] = value
+            print(f"[BENCH] 이력 {size}건 완료", file=sys.stderr)
+        for name, value in bench_extraction(server, keywords, args.pages).items():
+            results[f"extraction/{name}"] = value
+        results["summary/compact_article"] = bench_presummary(keywords, args.pages)
+    finally:
+        server.close()
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "sizes": args.sizes,
+            "http_latency": args.http_latency,
+            "gemini_latency": args.gemini_latency,
+        },
+        "results": results,
+    }
+
+# ============== 비교 ==============
+def compare(old, new):
+    """두 벤치마크 결과의 total_s / p50_ms 변화를 표로 출력"""
+    print(f"{'항목':<48} {'지표':<10} {'이전':>12} {'이후':>12} {'변화':>9}")
+    for name in sorted(set(old["results"]) | set(new["results"])):
+        before, after = old["results"].get(name), new["results"].get(name)
+        if before is None or after is None:
+            print(f"{name:<48} {'-':<10} {'없음' if before is None else '':>12} {'없음' if after is None else '':>12}")
+            continue
+        for metric in ("total_s", "p50_ms", "p95_ms"):
+            if metric not in before or metric not in after:
+                continue
+            b, a = before[metric], after[metric]
+            change = f"{(a - b) / b * 100:+.1f}%" if b else "-"
+            print(f"{name:<48} {metric:<10} {b:>12.4f} {a:>12.4f} {change:>9}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="뉴스 봇 오프라인 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="벤치마크 실행")
+    run.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    run.add_argument("--queries", type=int, default=200, help="중복 판정 조회 제목 수")
+    run.add_argument("--pages", type=int, default=40, help="본문 추출 페이지 수")
+    run.add_argument("--items-per-feed", type=int, default=20)
+    run.add_argument("--http-latency", type=float, default=0.05, help="로컬 서버 응답 지연(초)")
+    run.add_argument("--gemini-latency", type=float, default=0.5, help="가짜 Gemini 응답 지연(초)")
+    run.add_argument("--brute-force-limit", type=int, default=10000,
+                     help="이 크기 이하의 이력에서만 기존 전체 비교 방식도 측정")
+    run.add_argument("--skip-e2e", action="store_true", help="main() 전체 실행 측정 생략")
+    run.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    startup = sub.add_parser("startup", help="시작 시간 측정 (제한 초과 시 종료 코드 1)")
+    startup.add_argument("--runs", type=int, default=5)
+    startup.add_argument("--limit", type=float, default=STARTUP_LIMIT_SEC, help="허용 시간(초)")
+    check = sub.add_parser("check", help="동작 검사 (실패 시 종료 코드 1)")
+    check.add_argument("names", nargs="*", metavar="NAME",
+                       help=f"실행할 검사 (기본값: 전체, {', '.join(CHECKS)})")
+    cmp_parser = sub.add_parser("compare", help="두 결과 비교")
+    cmp_parser.add_argument("old")
+    cmp_parser.add_argument("new")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "compare":
+        with open(args.old, encoding="utf-8") as f_old, open(args.new, encoding="utf-8") as f_new:
+            compare(json.load(f_old), json.load(f_new))
+        return
+    if args.command == "check":
+        unknown = [name for name in args.names if name not in CHECKS]
+        if unknown:
+            print(f"[ERROR] 알 수 없는 검사: {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(2)
+        if run_checks(args.names):
+            sys.exit(1)
+        return
+    if args.command == "startup":
+        results = bench_startup(args.runs)
+        for name, value in results.items():
+            print(f"{name:<10} 최소 {value['min_s']:.3f}s  p50 {value['p50_ms']:.1f}ms")
+        slow = check_startup(results, args.limit)
+        if slow:
+            print(f"[ERROR] 시작 시간이 {args.limit}s를 넘었습니다: {', '.join(slow)}", file=sys.stderr)
+            sys.exit(1)
+        return
+    report = run_benchmarks(args)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"[DONE] 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
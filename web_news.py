@@ -1,30 +1,69 @@
 # web_news.py
-import requests
-import pandas as pd
 import os
 import smtplib
 import time
 import re
 import json
+import argparse
+import functools
+import gzip
+import hashlib
+import importlib
+import sqlite3
+import pickle
+import multiprocessing
+import random
+import uuid
+from collections import Counter
+from collections.abc import MutableMapping
+from contextlib import closing
 from pathlib import Path
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import parsedate_to_datetime
 from datetime import datetime, timedelta
-import trafilatura
 import difflib
-import urllib3
 import xml.etree.ElementTree as ET
-from urllib.parse import quote
-from googlenewsdecoder import new_decoderv1
-from google import genai
-from google.genai import types
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from html import unescape
+from urllib.parse import quote, urlparse
 
-# SSL 경고 무시
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+class LazyModule:
+    """처음 사용할 때 import하는 모듈 (import/CLI 시작 시간을 줄이기 위해 무거운 의존성에 사용)"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+requests = LazyModule("requests")
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+trafilatura = LazyModule("trafilatura")
 
 # ============== 설정 ==============
 DATA_DIR = Path("data")
 CONFIG_PATH = Path("config.json")
+TITLE_INDEX_PATH = DATA_DIR / "title_index.pkl.gz"
+URL_CACHE_PATH = DATA_DIR / "url_cache.sqlite3"
+HTTP_CACHE_PATH = DATA_DIR / "http_cache.sqlite3"
+SUMMARY_CACHE_PATH = DATA_DIR / "summary_cache.sqlite3"
+STORE_DIR = DATA_DIR / "store"
+REPORT_DIR = DATA_DIR / "reports"
+FEED_STATE_PATH = DATA_DIR / "feed_state.json"
+JOURNAL_DIR = DATA_DIR / "journal"
+STATS_PATH = DATA_DIR / "aggregates.sqlite3"
+
+# 기사 저장 컬럼 / CSV 내보내기 컬럼
+ARTICLE_COLS = ["키워드","관련키워드","제목","원문링크","실제링크","출처","신뢰도","발행일(KST)","수집시각(KST)","요약","_title_norm"]
+DISPLAY_COLS = ["키워드","관련키워드","제목","출처","요약","원문링크","실제링크","발행일(KST)","수집시각(KST)","_title_norm"]
+DEDUP_COLS = ["_title_norm","원문링크","실제링크"]
 
 # 신뢰도 점수 시스템
 TRUSTED_SOURCES = {
@@ -43,72 +82,688 @@ TRUSTED_SOURCES = {
     "default": 50
 }
 
-def load_config():
-    """config.json에서 설정을 로드합니다."""
-    default_config = {
-        "keywords": [
-            {"name": "일학습병행", "color": "#3498db", "enabled": True},
-            {"name": "직업훈련", "color": "#e67e22", "enabled": True},
-            {"name": "고용노동부", "color": "#7f8c8d", "enabled": True},
-            {"name": "한국산업인력공단", "color": "#2c3e50", "enabled": True}
-        ],
-        "receivers": [],
-        "settings": {
-            "similarity_threshold": 0.5,
-            "max_articles_per_keyword": 50
-        }
+# 언론사 도메인 (변환된 실제 기사 URL의 호스트로 출처 판별)
+# 호스트가 정확히 일치해야 하며(www./m. 제외), 자회사(biz.chosun.com 등)와 구분하도록 뉴스 하위 도메인은 따로 적음
+SOURCE_DOMAINS = {
+    "yna.co.kr": "연합뉴스", "yonhapnewstv.co.kr": "연합뉴스TV",
+    "kbs.co.kr": "KBS", "news.kbs.co.kr": "KBS", "imbc.com": "MBC", "imnews.imbc.com": "MBC",
+    "sbs.co.kr": "SBS", "news.sbs.co.kr": "SBS", "ytn.co.kr": "YTN", "jtbc.co.kr": "JTBC", "news.jtbc.co.kr": "JTBC",
+    "chosun.com": "조선일보", "joongang.co.kr": "중앙일보", "donga.com": "동아일보",
+    "hani.co.kr": "한겨레", "khan.co.kr": "경향신문", "hankookilbo.com": "한국일보",
+    "kmib.co.kr": "국민일보", "news.kmib.co.kr": "국민일보",
+    "mk.co.kr": "매일경제", "hankyung.com": "한국경제", "sedaily.com": "서울경제",
+    "mt.co.kr": "머니투데이", "news.mt.co.kr": "머니투데이", "edaily.co.kr": "이데일리", "fnnews.com": "파이낸셜뉴스",
+    "news1.kr": "뉴스1", "newsis.com": "뉴시스", "nocutnews.co.kr": "노컷뉴스", "ohmynews.com": "오마이뉴스",
+}
+
+# 언론사명 뒤에 붙어도 같은 언론사로 보는 말 (예: KBS뉴스, MBC뉴스)
+SOURCE_NAME_SUFFIXES = ("뉴스", "방송", "신문", "닷컴")
+
+DEFAULT_CONFIG = {
+    "keywords": [
+        {"name": "일학습병행", "color": "#3498db", "enabled": True},
+        {"name": "직업훈련", "color": "#e67e22", "enabled": True},
+        {"name": "고용노동부", "color": "#7f8c8d", "enabled": True},
+        {"name": "한국산업인력공단", "color": "#2c3e50", "enabled": True}
+    ],
+    "receivers": [],
+    "sources": [],
+    "tenants": [],
+    "settings": {
+        "similarity_threshold": 0.5,
+        "max_articles_per_keyword": 50,
+        "rss_workers": 4,
+        "per_host_limit": 4,
+        "extract_workers": 8,
+        "extract_deadline_sec": 300,
+        "extract_processes": 0,
+        "html_prefilter": True,
+        "decode_workers": 4,
+        "url_cache_ttl_days": 30,
+        "url_cache_max_entries": 20000,
+        "summary_mode": "batch",
+        "summary_batch_size": 5,
+        "summary_batch_token_budget": 8000,
+        "summary_cache_max_entries": 5000,
+        "extractive_presummary": True,
+        "extractive_token_budget": 800,
+        "extractive_fallback": True,
+        "export_all_csv": False,
+        "grouping_mode": "llm",
+        "local_cluster_threshold": 0.5,
+        "local_ambiguous_threshold": 0.3,
+        "grouping_chunk_size": 40,
+        "incremental": True,
+        "incremental_grace_minutes": 180,
+        "pipeline_mode": "streaming",
+        "summary_workers": 1,
+        "stream_queue_size": 16,
+        "journal_retention_days": 7,
+        "backfill_rpm": 30,
+        "http_cache_mode": "on",
+        "http_cache_ttl_hours": 72,
+        "http_cache_max_mb": 200,
+        "gemini_rpm": 10,
+        "gemini_tpm": 1000000,
+        "gemini_concurrency": 2,
+        "gemini_max_retries": 4,
+        "gemini_breaker_threshold": 5,
+        "gemini_breaker_cooldown_sec": 120,
+        "smtp_host": "smtp.gmail.com",
+        "smtp_port": 587,
+        "smtp_starttls": True,
+        "smtp_max_retries": 3,
+        "trend_weeks": 4
     }
-    
-    if CONFIG_PATH.exists():
+}
+
+def load_config(path=None):
+    """config.json에서 설정을 로드합니다."""
+    path = Path(path) if path else CONFIG_PATH
+    if path.exists():
         try:
-            with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 config = json.load(f)
-                for key in default_config:
+                for key in DEFAULT_CONFIG:
                     if key not in config:
-                        config[key] = default_config[key]
-                for key in default_config["settings"]:
+                        config[key] = DEFAULT_CONFIG[key]
+                for key in DEFAULT_CONFIG["settings"]:
                     if key not in config.get("settings", {}):
-                        config.setdefault("settings", {})[key] = default_config["settings"][key]
+                        config.setdefault("settings", {})[key] = DEFAULT_CONFIG["settings"][key]
                 return config
         except Exception as e:
-            print(f"[WARN] config.json 로드 실패: {e}, 기본값 사용")
-            return default_config
-    return default_config
-
-# 설정 로드
-CONFIG = load_config()
-KEYWORDS = [kw["name"] for kw in CONFIG["keywords"] if kw.get("enabled", True)]
-KEYWORD_COLORS = {kw["name"]: kw["color"] for kw in CONFIG["keywords"]}
-SIMILARITY_THRESHOLD = CONFIG["settings"].get("similarity_threshold", 0.5)
-MAX_ARTICLES = CONFIG["settings"].get("max_articles_per_keyword", 50)
-
-# 환경변수 로드
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-EMAIL_USER = os.environ.get("EMAIL_USER")
-EMAIL_PASSWORD = os.environ.get("EMAIL_PASSWORD")
-
-# 이메일 수신자: 환경변수 + config.json 병합
-ENV_RECEIVERS = os.environ.get("EMAIL_RECEIVER", "")
-CONFIG_RECEIVERS = [r["email"] for r in CONFIG.get("receivers", []) if r.get("enabled", True)]
-env_receiver_list = [addr.strip() for addr in ENV_RECEIVERS.split(',') if addr.strip()]
-ALL_RECEIVERS = list(set(env_receiver_list + CONFIG_RECEIVERS))
+            print(f"[WARN] {path} 로드 실패: {e}, 기본값 사용")
+    return json.loads(json.dumps(DEFAULT_CONFIG))
+
+def apply_settings(config):
+    """config의 키워드/settings 값을 모듈 설정값에 반영"""
+    global KEYWORDS, KEYWORD_COLORS, SIMILARITY_THRESHOLD, MAX_ARTICLES, RSS_WORKERS, \
+           PER_HOST_LIMIT, EXTRACT_WORKERS, EXTRACT_DEADLINE_SEC, EXTRACT_PROCESSES, \
+           HTML_PREFILTER, DECODE_WORKERS, URL_CACHE_TTL_DAYS, URL_CACHE_MAX_ENTRIES, SUMMARY_MODE, \
+           SUMMARY_BATCH_SIZE, SUMMARY_BATCH_TOKEN_BUDGET, SUMMARY_CACHE_MAX_ENTRIES, \
+           EXTRACTIVE_PRESUMMARY, EXTRACTIVE_TOKEN_BUDGET, EXTRACTIVE_FALLBACK, \
+           EXPORT_ALL_CSV, GROUPING_MODE, LOCAL_CLUSTER_THRESHOLD, LOCAL_AMBIGUOUS_THRESHOLD, \
+           GROUPING_CHUNK_SIZE, INCREMENTAL, INCREMENTAL_GRACE_MINUTES, PIPELINE_MODE, \
+           SUMMARY_WORKERS, STREAM_QUEUE_SIZE, JOURNAL_RETENTION_DAYS, BACKFILL_RPM, HTTP_CACHE_MODE, \
+           HTTP_CACHE_TTL_HOURS, HTTP_CACHE_MAX_MB, GEMINI_RPM, GEMINI_TPM, GEMINI_CONCURRENCY, \
+           GEMINI_MAX_RETRIES, GEMINI_BREAKER_THRESHOLD, GEMINI_BREAKER_COOLDOWN_SEC, \
+           SMTP_HOST, SMTP_PORT, SMTP_STARTTLS, SMTP_MAX_RETRIES, TREND_WEEKS
+    settings = config["settings"]
+    KEYWORDS = [kw["name"] for kw in config["keywords"] if kw.get("enabled", True)]
+    KEYWORD_COLORS = {kw["name"]: kw.get("color", "#333333") for kw in config["keywords"]}
+    SIMILARITY_THRESHOLD = settings.get("similarity_threshold", 0.5)
+    MAX_ARTICLES = settings.get("max_articles_per_keyword", 50)
+    RSS_WORKERS = settings.get("rss_workers", 4)
+    PER_HOST_LIMIT = settings.get("per_host_limit", 4)
+    EXTRACT_WORKERS = settings.get("extract_workers", 8)
+    EXTRACT_DEADLINE_SEC = settings.get("extract_deadline_sec", 300)
+    EXTRACT_PROCESSES = settings.get("extract_processes", 0) or os.cpu_count() or 1
+    HTML_PREFILTER = settings.get("html_prefilter", True)
+    DECODE_WORKERS = settings.get("decode_workers", 4)
+    URL_CACHE_TTL_DAYS = settings.get("url_cache_ttl_days", 30)
+    URL_CACHE_MAX_ENTRIES = settings.get("url_cache_max_entries", 20000)
+    SUMMARY_MODE = settings.get("summary_mode", "batch")
+    SUMMARY_BATCH_SIZE = settings.get("summary_batch_size", 5)
+    SUMMARY_BATCH_TOKEN_BUDGET = settings.get("summary_batch_token_budget", 8000)
+    SUMMARY_CACHE_MAX_ENTRIES = settings.get("summary_cache_max_entries", 5000)
+    EXTRACTIVE_PRESUMMARY = settings.get("extractive_presummary", True)
+    EXTRACTIVE_TOKEN_BUDGET = settings.get("extractive_token_budget", 800)
+    EXTRACTIVE_FALLBACK = settings.get("extractive_fallback", True)
+    EXPORT_ALL_CSV = settings.get("export_all_csv", False)
+    GROUPING_MODE = settings.get("grouping_mode", "llm")
+    LOCAL_CLUSTER_THRESHOLD = settings.get("local_cluster_threshold", 0.5)
+    LOCAL_AMBIGUOUS_THRESHOLD = settings.get("local_ambiguous_threshold", 0.3)
+    GROUPING_CHUNK_SIZE = settings.get("grouping_chunk_size", 40)
+    INCREMENTAL = settings.get("incremental", True)
+    INCREMENTAL_GRACE_MINUTES = settings.get("incremental_grace_minutes", 180)
+    PIPELINE_MODE = settings.get("pipeline_mode", "streaming")
+    SUMMARY_WORKERS = settings.get("summary_workers", 1)
+    STREAM_QUEUE_SIZE = settings.get("stream_queue_size", 16)
+    JOURNAL_RETENTION_DAYS = settings.get("journal_retention_days", 7)
+    BACKFILL_RPM = settings.get("backfill_rpm", 30)
+    HTTP_CACHE_MODE = settings.get("http_cache_mode", "on")
+    HTTP_CACHE_TTL_HOURS = settings.get("http_cache_ttl_hours", 72)
+    HTTP_CACHE_MAX_MB = settings.get("http_cache_max_mb", 200)
+    GEMINI_RPM = settings.get("gemini_rpm", 10)
+    GEMINI_TPM = settings.get("gemini_tpm", 1000000)
+    GEMINI_CONCURRENCY = settings.get("gemini_concurrency", 2)
+    GEMINI_MAX_RETRIES = settings.get("gemini_max_retries", 4)
+    GEMINI_BREAKER_THRESHOLD = settings.get("gemini_breaker_threshold", 5)
+    GEMINI_BREAKER_COOLDOWN_SEC = settings.get("gemini_breaker_cooldown_sec", 120)
+    SMTP_HOST = settings.get("smtp_host", "smtp.gmail.com")
+    SMTP_PORT = settings.get("smtp_port", 587)
+    SMTP_STARTTLS = settings.get("smtp_starttls", True)
+    SMTP_MAX_RETRIES = settings.get("smtp_max_retries", 3)
+    TREND_WEEKS = settings.get("trend_weeks", 4)
+
+def receiver_subscriptions(config, receivers=()):
+    """{이메일: 구독 키워드 목록 (None이면 전체 키워드)}
+
+    receivers(환경변수 수신자)는 전체 키워드를 받고, config.json receivers 항목에
+    "keywords"가 있으면 그 키워드만 받습니다.
+    """
+    subscriptions = {addr: None for addr in receivers}
+    for receiver in config.get("receivers", []):
+        if not receiver.get("enabled", True):
+            continue
+        addr = receiver["email"]
+        keywords = receiver.get("keywords") or None
+        if addr in subscriptions and (subscriptions[addr] is None or keywords is None):
+            subscriptions[addr] = None
+        elif addr in subscriptions:
+            subscriptions[addr] += [kw for kw in keywords if kw not in subscriptions[addr]]
+        else:
+            subscriptions[addr] = list(keywords) if keywords else None
+    return subscriptions
+
+def load_env(config):
+    """환경변수(API 키, 메일 계정)와 이메일 수신자 목록 로드"""
+    global GEMINI_API_KEY, EMAIL_USER, EMAIL_PASSWORD, ALL_RECEIVERS
+    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+    EMAIL_USER = os.environ.get("EMAIL_USER")
+    EMAIL_PASSWORD = os.environ.get("EMAIL_PASSWORD")
+
+    # 이메일 수신자: 환경변수 + config.json 병합 ({이메일: 구독 키워드})
+    env_receivers = os.environ.get("EMAIL_RECEIVER", "")
+    env_receiver_list = [addr.strip() for addr in env_receivers.split(',') if addr.strip()]
+    ALL_RECEIVERS = receiver_subscriptions(config, env_receiver_list)
+
+def select_keywords(config, keywords):
+    """이번 실행에서 수집할 키워드만 켠 config 반환 (config에 없는 키워드는 기본 색으로 추가)"""
+    known = {kw["name"]: kw for kw in config["keywords"]}
+    config = dict(config)
+    config["keywords"] = [dict(known.get(name, {"name": name, "color": "#333333"}), enabled=True)
+                          for name in keywords]
+    return config
+
+_configured = False
+
+def configure(config_path=None, keywords=None):
+    """설정 파일과 환경변수를 읽어 모듈 설정값에 반영 (실행 전에 한 번 호출)
+
+    import만으로는 파일/환경변수를 읽지 않으며, 그 전까지 설정값은 DEFAULT_CONFIG 기본값입니다.
+    """
+    global CONFIG, SOURCE_RESOLVER, GEMINI_SCHEDULER, _configured
+    CONFIG = load_config(config_path)
+    if keywords:
+        CONFIG = select_keywords(CONFIG, keywords)
+    apply_settings(CONFIG)
+    load_env(CONFIG)
+    SOURCE_RESOLVER = SourceResolver.from_config(CONFIG)
+    GEMINI_SCHEDULER = make_gemini_scheduler()
+    _configured = True
+    return CONFIG
+
+# 설정 기본값 (configure()가 config.json/환경변수 값으로 갱신)
+CONFIG = DEFAULT_CONFIG
+apply_settings(CONFIG)
+GEMINI_API_KEY = EMAIL_USER = EMAIL_PASSWORD = None
+ALL_RECEIVERS = {}
+
+# ============== 실행 계측 ==============
+class RunMetrics:
+    """단계별 소요 시간, 네트워크 함수 호출/실패/다운로드 바이트, 대기 시간 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.stages = {}
+            self.functions = {}
+            self.counters = {}
+            self.sleep_seconds = 0.0
+            self.bytes_downloaded = 0
+            self._current_stage = None
+
+    def begin_stage(self, name):
+        """이전 단계를 마감하고 새 단계 시간 측정 시작"""
+        self.end_stage()
+        self._current_stage = (name, time.perf_counter())
+
+    def end_stage(self):
+        if self._current_stage is None:
+            return
+        name, started = self._current_stage
+        self._current_stage = None
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def _function(self, name):
+        return self.functions.setdefault(name, {"calls": 0, "failures": 0, "seconds": 0.0, "bytes": 0})
+
+    def record_call(self, name, seconds, failed=False):
+        with self._lock:
+            stats = self._function(name)
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            if failed:
+                stats["failures"] += 1
+
+    def failure(self, name):
+        with self._lock:
+            self._function(name)["failures"] += 1
+
+    def add_bytes(self, count):
+        """다운로드 바이트 기록 (현재 스레드에서 실행 중인 계측 함수에도 합산)"""
+        stack = getattr(self._local, "stack", None)
+        with self._lock:
+            self.bytes_downloaded += count
+            if stack:
+                self._function(stack[-1])["bytes"] += count
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleep_seconds += seconds
+        time.sleep(seconds)
+
+    def push(self, name):
+        self._local.stack = getattr(self._local, "stack", []) + [name]
+
+    def pop(self):
+        self._local.stack = self._local.stack[:-1]
+
+    def to_dict(self):
+        self.end_stage()
+        with self._lock:
+            return {
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+                "total_seconds": round(time.time() - self.started_at, 3),
+                "stages": {k: round(v, 3) for k, v in self.stages.items()},
+                "functions": {k: dict(v, seconds=round(v["seconds"], 3)) for k, v in self.functions.items()},
+                "counters": dict(self.counters),
+                "sleep_seconds": round(self.sleep_seconds, 3),
+                "bytes_downloaded": self.bytes_downloaded,
+            }
+
+METRICS = RunMetrics()
+
+def instrumented(func):
+    """호출 수, 소요 시간, 예외(실패)를 METRICS에 기록하는 데코레이터"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        METRICS.push(func.__name__)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            METRICS.pop()
+            METRICS.record_call(func.__name__, time.perf_counter() - started, failed)
+    return wrapper
+
+def rate_limit_sleep(seconds):
+    """API 속도 제한 준수를 위한 대기 (대기 시간은 실행 리포트에 기록)"""
+    METRICS.sleep(seconds)
+
+def write_run_report(target_date_str=None):
+    """실행 리포트를 data/reports/run_YYYYmmdd_HHMMSS.json으로 저장"""
+    report = METRICS.to_dict()
+    report["target_date"] = target_date_str
+    try:
+        REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(METRICS.started_at).strftime("%Y%m%d_%H%M%S")
+        path = REPORT_DIR / f"run_{stamp}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] 실행 리포트 저장: {path}")
+    except Exception as e:
+        print(f"[WARN] 실행 리포트 저장 실패: {e}")
+    return report
+
+# ============== HTTP 세션 ==============
+GOOGLE_NEWS_RSS_BASE = "https://news.google.com/rss/search"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+_http_session = None
+_session_lock = threading.Lock()
+_host_semaphores = {}
+
+def get_http_session():
+    """keep-alive 연결을 재사용하는 공유 requests 세션 반환"""
+    global _http_session
+    with _session_lock:
+        if _http_session is None:
+            import urllib3
+            from requests.adapters import HTTPAdapter
+            # SSL 경고 무시
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            session = requests.Session()
+            pool_size = max(RSS_WORKERS, PER_HOST_LIMIT, 10)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({'User-Agent': USER_AGENT})
+            _http_session = session
+        return _http_session
+
+def host_slot(url):
+    """호스트별 동시 연결 수를 PER_HOST_LIMIT 이하로 제한하는 세마포어 반환"""
+    host = urlparse(url).netloc.lower()
+    with _session_lock:
+        sem = _host_semaphores.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(max(1, PER_HOST_LIMIT))
+            _host_semaphores[host] = sem
+        return sem
+
+class OfflineCacheMiss(ConnectionError):
+    """오프라인 재실행 중 캐시에 없는 URL 요청"""
+
+def http_get(url, timeout=10, cache_ttl=None, **kwargs):
+    """공유 세션 + 호스트별 동시성 제한으로 GET 요청
+
+    응답 캐시가 켜져 있으면 200 응답을 저장하고, cache_ttl(초) 안의 저장본은 다운로드 없이 반환합니다.
+    오프라인 모드에서는 저장본만 사용합니다 (없으면 OfflineCacheMiss).
+    """
+    cache = get_http_cache() if HTTP_CACHE_MODE != "off" else None
+    if HTTP_CACHE_MODE == "offline":
+        cached = cache.get(url) if cache is not None else None
+        if cached is None:
+            METRICS.count("http_cache_misses")
+            raise OfflineCacheMiss(f"오프라인 캐시에 없음: {url}")
+        METRICS.count("http_cache_hits")
+        return cached
+    if cache is not None and cache_ttl:
+        cached = cache.get(url, max_age=cache_ttl)
+        if cached is not None:
+            METRICS.count("http_cache_hits")
+            return cached
+        METRICS.count("http_cache_misses")
+    with host_slot(url):
+        resp = get_http_session().get(url, timeout=timeout, **kwargs)
+    METRICS.add_bytes(len(resp.content))
+    if cache is not None and resp.status_code == 200 and resp.content:
+        cache.put(url, resp)
+    return resp
+
+# ============== 디스크 캐시 ==============
+class SqliteCache:
+    """SQLite 기반 key-value 캐시 (선택적 TTL + 최근 사용 순 최대 개수 유지)"""
+
+    def __init__(self, path, ttl_days=None, max_entries=20000):
+        self.ttl_sec = ttl_days * 86400 if ttl_days else None
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl_sec is not None and now - row[1] > self.ttl_sec:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", (key, value, now, now)
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """만료 항목 삭제 후 최근 사용 순으로 max_entries개만 유지"""
+        with self._lock:
+            if self.ttl_sec is not None:
+                self._conn.execute("DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl_sec,))
+            self._conn.execute(
+                "DELETE FROM cache WHERE key NOT IN "
+                "(SELECT key FROM cache ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_caches = {}
+
+def open_cache(path, ttl_days=None, max_entries=20000):
+    """경로별로 하나씩 여는 SqliteCache 반환 (열 수 없으면 None)"""
+    with _session_lock:
+        if path not in _caches:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                _caches[path] = SqliteCache(path, ttl_days, max_entries)
+            except Exception as e:
+                print(f"[WARN] 캐시 열기 실패({path}): {e}")
+                return None
+        return _caches[path]
+
+class CachedResponse:
+    """HTTP 응답 캐시에서 꺼낸 응답 (requests.Response 중 파이프라인이 쓰는 속성만 제공)"""
+
+    def __init__(self, url, status_code, content, headers):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} (캐시): {self.url}")
+
+class HttpCache:
+    """URL -> 응답 본문 디스크 캐시 (본문은 내용 해시 기준으로 한 번만 gzip 저장, 전체 크기 제한 LRU)"""
+
+    KEEP_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+    def __init__(self, path, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            "hash TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, hash TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+
+    def get(self, url, max_age=None):
+        """저장된 응답 반환 (없거나 max_age초보다 오래됐으면 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT r.status, r.headers, r.fetched_at, b.data FROM responses r "
+                "JOIN blobs b ON b.hash = r.hash WHERE r.url = ?", (url,)
+            ).fetchone()
+            if row is None or (max_age is not None and now - row[2] > max_age):
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+        status, headers, _, data = row
+        return CachedResponse(url, status, gzip.decompress(data), json.loads(headers))
+
+    def put(self, url, resp):
+        content = resp.content
+        digest = hashlib.sha256(content).hexdigest()
+        headers = {k: resp.headers[k] for k in self.KEEP_HEADERS if k in resp.headers}
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone()
+            if not exists:
+                data = gzip.compress(content, compresslevel=6)
+                self._conn.execute("INSERT INTO blobs VALUES (?, ?, ?)", (digest, data, len(data)))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, digest, resp.status_code, json.dumps(headers), now, now),
+            )
+            self._conn.commit()
+
+    def total_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def evict(self):
+        """전체 압축 크기가 max_bytes 이하가 될 때까지 오래 안 쓴 응답부터 삭제"""
+        with self._lock:
+            sizes = dict(self._conn.execute("SELECT hash, size FROM blobs"))
+            total = sum(sizes.values())
+            if total <= self.max_bytes:
+                return
+            rows = self._conn.execute("SELECT url, hash FROM responses ORDER BY accessed_at").fetchall()
+            refs = Counter(h for _, h in rows)
+            for url, h in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                refs[h] -= 1
+                if refs[h] == 0:
+                    # 같은 본문을 가리키는 응답이 더 없을 때만 본문 삭제
+                    self._conn.execute("DELETE FROM blobs WHERE hash = ?", (h,))
+                    total -= sizes.get(h, 0)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def get_http_cache():
+    """data/http_cache.sqlite3 응답 캐시 반환 (열 수 없으면 None)"""
+    with _session_lock:
+        if HTTP_CACHE_PATH not in _caches:
+            try:
+                HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                _caches[HTTP_CACHE_PATH] = HttpCache(HTTP_CACHE_PATH, HTTP_CACHE_MAX_MB * 1024 * 1024)
+            except Exception as e:
+                print(f"[WARN] 캐시 열기 실패({HTTP_CACHE_PATH}): {e}")
+                return None
+        return _caches[HTTP_CACHE_PATH]
+
+# ============== 기사 레코드 ==============
+class Article(MutableMapping):
+    """기사 한 건 (dict와 같은 한글 키로 읽고 쓰지만 값은 __slots__에 저장)
+
+    수집 단계의 기사는 수천~수만 건이 한꺼번에 메모리에 있으므로 건마다 dict를 두지 않습니다.
+    정해진 필드(FIELDS) 외의 키는 KeyError입니다.
+    """
+
+    FIELDS = {
+        "키워드": "keyword", "관련키워드": "related_keywords", "제목": "title", "원문링크": "link",
+        "실제링크": "resolved_link", "출처": "source", "신뢰도": "score", "발행일(KST)": "published",
+        "수집시각(KST)": "collected", "요약": "summary", "_title_norm": "title_norm",
+        "_keywords": "keywords", "_merged_into": "merged_into", "_content": "content",
+    }
+    __slots__ = tuple(FIELDS.values())
+
+    def __init__(self, row=(), **fields):
+        for key, value in dict(row, **fields).items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self.FIELDS[key])
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, self.FIELDS[key], value)
+
+    def __delitem__(self, key):
+        try:
+            delattr(self, self.FIELDS[key])
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        for key, slot in self.FIELDS.items():
+            if hasattr(self, slot):
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Article({dict(self)!r})"
+
+    def copy(self):
+        return Article(self)
 
 # ============== 유틸 ==============
+_HTML_TAG = re.compile('<.*?>')
+_TITLE_BRACKETS = re.compile(r'\[.*?\]|\(.*?\)')
+# 파이썬 \s와 같은 공백 문자 집합 (pyarrow 정규식(RE2)의 \s는 ASCII 공백만 포함하므로 직접 나열)
+_WHITESPACE = "\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+_TITLE_PUNCT = re.compile(f'[^가-힣a-zA-Z0-9{_WHITESPACE}]')
+
 def clean_html(raw_html):
     """HTML 태그 및 특수문자 제거"""
     if not raw_html: return ""
-    cleanr = re.compile('<.*?>')
-    cleantext = re.sub(cleanr, '', raw_html)
+    cleantext = _HTML_TAG.sub('', raw_html)
     return cleantext.replace("&quot;", "'").replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">").replace("&#39;", "'")
 
 def normalize_title(title):
     """제목 정규화 (중복 방지를 위해 언론사명, 구두점 등 제거)"""
     # 1. [...]나 (...) 형태의 언론사 태그 제거
-    title = re.sub(r'\[.*?\]|\(.*?\)', '', title)
+    title = _TITLE_BRACKETS.sub('', title)
     # 2. 특수문자 제거 및 공백 유지 (단어 단위 분절을 위해)
-    title = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', title)
+    title = _TITLE_PUNCT.sub('', title)
     return title.strip()
 
+@functools.lru_cache(maxsize=16)
+def keyword_pattern(keywords):
+    """키워드들을 한 번에 지우는 정규식 (긴 키워드 우선, 키워드가 없으면 None)"""
+    keywords = sorted({kw for kw in keywords if kw}, key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, keywords))) if keywords else None
+
+def strip_keywords(title, keywords):
+    """정규화된 제목에서 검색 키워드 제거 (키워드가 달라도 같은 기사를 비교할 수 있도록)"""
+    pattern = keyword_pattern(tuple(keywords))
+    return pattern.sub('', title) if pattern else title
+
+def normalize_titles(titles, keywords=()):
+    """제목 컬럼 전체를 한 번에 정규화 + 키워드 제거 (normalize_title → strip_keywords와 같은 결과)
+
+    pyarrow 문자열 컬럼이면 pandas .str 벡터 연산(정규식 문자열 패턴)으로 처리합니다.
+    """
+    titles = pd.Series(titles).fillna("")
+    if getattr(titles.dtype, "storage", None) != "pyarrow":
+        # 이미 pyarrow 문자열이면 그대로 두고, 아니면 str로 변환 (pandas 3 + pyarrow면 변환 결과도 pyarrow)
+        titles = titles.astype(str)
+    if getattr(titles.dtype, "storage", None) != "pyarrow":
+        # pyarrow가 없으면 .str 연산도 행마다 파이썬 정규식을 돌리므로 미리 컴파일한 패턴을 직접 사용
+        return pd.Series([strip_keywords(normalize_title(t), keywords) for t in titles.tolist()],
+                         index=titles.index, dtype=titles.dtype)
+    titles = (titles.str.replace(_TITLE_BRACKETS.pattern, '', regex=True)
+                    .str.replace(_TITLE_PUNCT.pattern, '', regex=True)
+                    .str.replace(f'^[{_WHITESPACE}]+|[{_WHITESPACE}]+$', '', regex=True))
+    pattern = keyword_pattern(tuple(keywords))
+    if pattern is not None:
+        titles = titles.str.replace(pattern.pattern, '', regex=True)
+    return titles
+
 def is_similar_title(t1, t2, threshold=0.5):
     """두 제목이 실질적으로 같은 내용을 다루는지 검사"""
     if not t1 or not t2: return False
@@ -133,6 +788,179 @@ def is_similar_title(t1, t2, threshold=0.5):
         
     return False
 
+# ============== 중복 판정 색인 ==============
+class TitleIndex:
+    """이력 제목/URL 역색인 (is_similar_title()과 같은 판정을 전체 비교 없이 수행)
+
+    - 문자 빈도 역색인: difflib 일치 문자 수는 두 문자열의 문자 빈도 교집합을
+      넘을 수 없으므로, 그 상한으로도 threshold에 못 미치는 제목은 비교 생략
+    - 단어 역색인: 공통 단어 수를 세어 60% 단어 겹침 규칙을 색인만으로 계산
+    후보로 남은 제목만 is_similar_title()로 최종 판정하므로 결과는 기존과 동일합니다.
+    """
+    VERSION = 2
+
+    def __init__(self):
+        self.titles = []
+        self.urls = set()
+        self._title_ids = {}
+        self._lengths = []
+        self._word_counts = []
+        self._char_postings = {}   # 문자 -> ([제목 id], [등장 횟수])
+        self._word_postings = {}   # 단어 -> [제목 id]
+        self._array_cache = {}
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title, url=None):
+        """제목(정규화된 _title_norm)과 URL을 색인에 추가"""
+        if url:
+            self.urls.add(url)
+        if not title or title in self._title_ids:
+            return
+        doc_id = len(self.titles)
+        self.titles.append(title)
+        self._title_ids[title] = doc_id
+        compact = title.replace(" ", "")
+        self._lengths.append(len(compact))
+        for ch, count in Counter(compact).items():
+            ids, counts = self._char_postings.setdefault(ch, ([], []))
+            ids.append(doc_id)
+            counts.append(count)
+        words = set(title.split())
+        self._word_counts.append(len(words))
+        for word in words:
+            self._word_postings.setdefault(word, []).append(doc_id)
+
+    def _arrays(self, key, postings):
+        """역색인 리스트를 NumPy 배열로 변환 (길이가 바뀐 경우에만 재생성)"""
+        cached = self._array_cache.get(key)
+        if cached is None or cached[0] != len(postings[0]):
+            cached = (len(postings[0]),) + tuple(np.asarray(p, dtype=np.int64) for p in postings)
+            self._array_cache[key] = cached
+        return cached[1:]
+
+    def candidates(self, title, threshold):
+        """유사할 가능성이 있는 제목 id 목록 (상한 필터 통과분)"""
+        n = len(self.titles)
+        if n == 0:
+            return []
+        compact = title.replace(" ", "")
+        overlap = np.zeros(n, dtype=np.int64)
+        for ch, count in Counter(compact).items():
+            postings = self._char_postings.get(ch)
+            if postings:
+                ids, counts = self._arrays(("c", ch), postings)
+                overlap[ids] += np.minimum(counts, count)
+        lengths = self._arrays(("len",), (self._lengths,))[0]
+        maybe = 2 * overlap >= threshold * (len(compact) + lengths) - 1e-9
+
+        words = set(title.split())
+        if words:
+            shared = np.zeros(n, dtype=np.int64)
+            for word in words:
+                ids = self._word_postings.get(word)
+                if ids:
+                    shared[self._arrays(("w", word), (ids,))[0]] += 1
+            word_counts = self._arrays(("wc",), (self._word_counts,))[0]
+            smaller = np.minimum(len(words), word_counts)
+            maybe |= (shared > 0) & (shared >= 0.6 * smaller - 1e-9)
+        return np.flatnonzero(maybe)
+
+    def find_similar(self, title, threshold=0.5):
+        """색인 안에서 title과 유사한 제목을 찾아 반환 (없으면 None)"""
+        if not title:
+            return None
+        for doc_id in self.candidates(title, threshold):
+            if is_similar_title(title, self.titles[doc_id], threshold):
+                return self.titles[doc_id]
+        return None
+
+    def is_duplicate(self, title, url, threshold=0.5):
+        """URL 일치 또는 제목 유사도로 중복 여부 판정"""
+        if url in self.urls:
+            return True
+        return self.find_similar(title, threshold) is not None
+
+    @classmethod
+    def build(cls, titles, urls):
+        index = cls()
+        for url in urls:
+            index.urls.add(url)
+        for title in titles:
+            index.add(title)
+        return index
+
+    def sync(self, titles, urls):
+        """이력과 색인을 맞춤 (새 항목은 추가, 이력에서 사라진 항목이 있으면 재구축)"""
+        titles = [t for t in titles if t]
+        title_set, url_set = set(titles), set(urls)
+        if not set(self._title_ids).issubset(title_set) or not self.urls.issubset(url_set):
+            return TitleIndex.build(titles, urls)
+        for title in titles:
+            self.add(title)
+        self.urls |= url_set
+        return self
+
+    def save(self, path):
+        state = {
+            "version": self.VERSION,
+            "titles": self.titles,
+            "urls": sorted(self.urls),
+            "lengths": self._lengths,
+            "word_counts": self._word_counts,
+            "char_postings": self._char_postings,
+            "word_postings": self._word_postings,
+        }
+        # 압축 수준 1: 9 대비 크기는 비슷하고 저장 시간은 1/10 수준
+        with gzip.open(path, "wb", compresslevel=1) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != cls.VERSION:
+            raise ValueError(f"색인 버전 불일치: {state.get('version')}")
+        index = cls()
+        index.titles = state["titles"]
+        index.urls = set(state["urls"])
+        index._title_ids = {t: i for i, t in enumerate(index.titles)}
+        index._lengths = state["lengths"]
+        index._word_counts = state["word_counts"]
+        index._char_postings = state["char_postings"]
+        index._word_postings = state["word_postings"]
+        return index
+
+def history_urls(df):
+    """이력의 구글 뉴스 링크와 변환된 실제 기사 링크 목록"""
+    urls = list(df["원문링크"].dropna().astype(str))
+    if "실제링크" in df.columns:
+        urls += [u for u in df["실제링크"].dropna().astype(str) if u]
+    return urls
+
+def load_title_index(df_existing, path=None):
+    """data/의 제목 색인을 불러와 저장된 이력과 동기화"""
+    path = path or TITLE_INDEX_PATH
+    titles = list(df_existing["_title_norm"].dropna().astype(str))
+    urls = history_urls(df_existing)
+    if path.exists():
+        try:
+            return TitleIndex.load(path).sync(titles, urls)
+        except Exception as e:
+            print(f"[WARN] 제목 색인 로드 실패: {e}, 재구축")
+    return TitleIndex.build(titles, urls)
+
+def save_title_index(index, df_new, path=None):
+    """새로 저장한 기사를 제목 색인에 추가하여 data/에 기록"""
+    for title in df_new["_title_norm"].dropna().astype(str):
+        index.add(title)
+    index.urls.update(history_urls(df_new))
+    try:
+        index.save(path or TITLE_INDEX_PATH)
+    except Exception as e:
+        print(f"[WARN] 제목 색인 저장 실패: {e}")
+
 def filter_unique_articles_with_llm(articles):
     """LLM을 사용하여 서로 다른 언론사의 비슷한 기사들을 그룹화하고 대표 기사만 선정"""
     if len(articles) <= 1:
@@ -151,7 +979,6 @@ def filter_unique_articles_with_llm(articles):
     
     print(f"   [AI 그룹화] {len(articles)}건 분석 중...")
     response = call_gemini_api(prompt)
-    time.sleep(6) # API Rate Limit 준수
     
     if not response:
         return articles
@@ -178,48 +1005,463 @@ def filter_unique_articles_with_llm(articles):
         print(f"   [WARN] AI 그룹화 분석 실패: {e}")
         return articles
 
+# ============== 로컬 제목 군집화 ==============
+def grouping_text(title):
+    """군집화용 제목 (끝의 ' - 언론사' 표기와 구두점 제거)"""
+    return normalize_title(re.sub(r'\s+-\s+[^-]+$', '', title or ""))
+
+def title_tfidf_matrix(titles, n=2):
+    """문자 n-gram TF-IDF 행렬 (행 단위 L2 정규화)"""
+    vocab = {}
+    rows = []
+    for title in titles:
+        text = f" {title} "
+        grams = Counter(text[i:i + n] for i in range(max(1, len(text) - n + 1)))
+        rows.append({vocab.setdefault(g, len(vocab)): c for g, c in grams.items()})
+    matrix = np.zeros((len(titles), max(1, len(vocab))), dtype=np.float64)
+    for i, row in enumerate(rows):
+        matrix[i, list(row)] = list(row.values())
+    df = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + len(titles)) / (1 + df)) + 1.0
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def connected_groups(adjacency):
+    """인접 행렬의 연결 요소를 원래 순서(첫 원소 기준)대로 반환"""
+    n = adjacency.shape[0]
+    labels = np.full(n, -1)
+    groups = []
+    for start in range(n):
+        if labels[start] >= 0:
+            continue
+        labels[start] = len(groups)
+        group, stack = [], [start]
+        while stack:
+            i = stack.pop()
+            group.append(i)
+            for j in np.flatnonzero(adjacency[i] & (labels < 0)):
+                labels[j] = labels[start]
+                stack.append(j)
+        groups.append(sorted(group))
+    return groups
+
+def cluster_articles(articles, threshold=None):
+    """제목 코사인 유사도가 threshold 이상인 기사끼리 묶고 (군집 목록, 유사도 행렬) 반환"""
+    threshold = LOCAL_CLUSTER_THRESHOLD if threshold is None else threshold
+    matrix = title_tfidf_matrix([grouping_text(a["제목"]) for a in articles])
+    similarity = matrix @ matrix.T
+    return connected_groups(similarity >= threshold), similarity
+
+def representative(articles, group):
+    """군집 대표 기사 (신뢰도 최고, 같으면 먼저 수집된 기사)"""
+    return max(group, key=lambda i: (articles[i].get("신뢰도", 50), -i))
+
+def filter_unique_articles_local(articles):
+    """로컬 TF-IDF 군집화로 같은 소식을 묶고 군집별 대표 기사만 선정"""
+    if len(articles) <= 1:
+        return articles
+    groups, _ = cluster_articles(articles)
+    chosen = sorted(representative(articles, g) for g in groups)
+    print(f"   [로컬 그룹화] {len(articles)}건 -> {len(chosen)}건")
+    return [articles[i] for i in chosen]
+
+def filter_unique_articles_hybrid(articles):
+    """로컬 군집화 후, 대표 기사끼리 애매하게 비슷한 군집만 LLM에 청크 단위로 확인"""
+    if len(articles) <= 1:
+        return articles
+    groups, similarity = cluster_articles(articles)
+    reps = [representative(articles, g) for g in groups]
+    rep_similarity = similarity[np.ix_(reps, reps)]
+    ambiguous = (rep_similarity >= LOCAL_AMBIGUOUS_THRESHOLD) & ~np.eye(len(reps), dtype=bool)
+
+    chosen = []
+    chunks, current = [], []
+    for group in connected_groups(ambiguous):
+        if len(group) == 1:
+            chosen.append(reps[group[0]])
+            continue
+        # 애매한 군집 묶음은 나누지 않고 청크에 담되, 청크 크기보다 크면 잘라서 보냄
+        members = [reps[i] for i in group]
+        for start in range(0, len(members), GROUPING_CHUNK_SIZE):
+            part = members[start:start + GROUPING_CHUNK_SIZE]
+            if current and len(current) + len(part) > GROUPING_CHUNK_SIZE:
+                chunks.append(current)
+                current = []
+            current.extend(part)
+    if current:
+        chunks.append(current)
+
+    print(f"   [로컬 그룹화] {len(articles)}건 -> {len(reps)}건 (LLM 확인 {sum(len(c) for c in chunks)}건)")
+    for chunk in chunks:
+        kept = filter_unique_articles_with_llm([articles[i] for i in chunk])
+        kept_ids = {id(a) for a in kept}
+        chosen.extend(i for i in chunk if id(articles[i]) in kept_ids)
+    return [articles[i] for i in sorted(chosen)]
+
+def group_similar_articles(articles):
+    """설정(grouping_mode)에 따라 같은 소식을 다루는 기사 중 대표 기사만 선정
+
+    - llm: 제목 전체를 Gemini에 전달 (grouping_chunk_size보다 많으면 hybrid로 처리)
+    - local: 로컬 TF-IDF 군집화만 사용 (API 호출 없음)
+    - hybrid: 로컬 군집화 후 애매한 군집만 Gemini로 확인
+    """
+    if GROUPING_MODE == "local":
+        return filter_unique_articles_local(articles)
+    if GROUPING_MODE == "hybrid" or len(articles) > GROUPING_CHUNK_SIZE:
+        return filter_unique_articles_hybrid(articles)
+    return filter_unique_articles_with_llm(articles)
+
+# ============== 출처 신뢰도 ==============
+class SourceResolver:
+    """언론사 판별기: 실제 기사 URL 도메인 우선, 없으면 RSS 출처명에서 가장 긴 언론사명 일치"""
+
+    def __init__(self, scores, domains=None, aliases=None, default_score=50):
+        self.scores = dict(scores)
+        self.default_score = default_score
+        self.domains = {self._host(d): name for d, name in (domains or {}).items()}
+        self.aliases = {name: name for name in self.scores}
+        self.aliases.update(aliases or {})
+
+    @functools.cached_property
+    def pattern(self):
+        """언론사명 일치 정규식 (컴파일 비용이 커서 처음 사용할 때 생성)"""
+        # 긴 이름을 앞에 두어 같은 위치에서는 긴 이름이 먼저 일치 (예: 연합뉴스TV > 연합뉴스)
+        names = sorted(self.aliases, key=len, reverse=True)
+        return re.compile("|".join(self._alternative(n) for n in names)) if names else None
+
+    @staticmethod
+    def _alternative(name):
+        """다른 언론사명의 일부로는 일치하지 않도록 앞뒤 경계 지정 (예: 한국경제TV 안의 한국경제)
+
+        뒤에 SOURCE_NAME_SUFFIXES가 붙은 경우(KBS뉴스)는 같은 언론사로 일치합니다.
+        """
+        suffixes = "|".join(SOURCE_NAME_SUFFIXES)
+        return rf"(?<![A-Za-z0-9가-힣]){re.escape(name)}(?!(?!{suffixes})[A-Za-z0-9가-힣])"
+
+    @staticmethod
+    def _host(host):
+        return host.lower().removeprefix("www.").removeprefix("m.")
+
+    @classmethod
+    def from_config(cls, config):
+        """기본 표(TRUSTED_SOURCES/SOURCE_DOMAINS)에 config.json "sources" 항목을 더해 생성"""
+        scores = {k: v for k, v in TRUSTED_SOURCES.items() if k != "default"}
+        domains = dict(SOURCE_DOMAINS)
+        aliases = {}
+        for outlet in config.get("sources", []):
+            name = outlet.get("name")
+            if not name:
+                continue
+            scores[name] = outlet.get("score", scores.get(name, TRUSTED_SOURCES["default"]))
+            for domain in outlet.get("domains", []):
+                domains[domain] = name
+            for alias in outlet.get("aliases", []):
+                aliases[alias] = name
+        default_score = config.get("settings", {}).get("default_source_score", TRUSTED_SOURCES["default"])
+        return cls(scores, domains, aliases, default_score)
+
+    def by_domain(self, url):
+        """URL 호스트로 언론사 조회 (등록된 호스트와 정확히 일치할 때만, www./m. 제외)"""
+        if not url:
+            return None
+        return self.domains.get(self._host(urlparse(url).hostname or ""))
+
+    def by_name(self, text):
+        """출처명에서 가장 긴 언론사명 일치 (완전 일치 우선)"""
+        if not text or self.pattern is None:
+            return None
+        text = text.strip()
+        if text in self.aliases:
+            return self.aliases[text]
+        matches = [m.group(0) for m in self.pattern.finditer(text)]
+        if not matches:
+            return None
+        return self.aliases[max(matches, key=len)]
+
+    def resolve(self, url="", source_name=""):
+        """(신뢰도 점수, 언론사명) 반환, 판별 실패 시 (기본 점수, "기타")"""
+        name = self.by_domain(url) or self.by_name(source_name)
+        if name is None:
+            return self.default_score, "기타"
+        return self.scores.get(name, self.default_score), name
+
+SOURCE_RESOLVER = SourceResolver.from_config(CONFIG)
+
 def get_source_score(url, title):
     """출처 신뢰도 점수 반환"""
-    text_to_check = url + " " + title
-    for source, score in TRUSTED_SOURCES.items():
-        if source == "default":
+    return SOURCE_RESOLVER.resolve(url, title)
+
+# ============== API 호출 속도 제어 ==============
+class CircuitOpenError(RuntimeError):
+    """연속 실패로 서킷 브레이커가 열려 호출을 보내지 않음"""
+
+def error_status(error):
+    """예외에서 HTTP 상태 코드 추출 (없으면 None)"""
+    for attr in ("code", "status_code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+def is_retryable(error):
+    """429(할당량 초과)와 5xx(서버 오류)만 재시도"""
+    status = error_status(error)
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+class RateScheduler:
+    """분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷 + 429/5xx 지수 백오프 재시도 + 서킷 브레이커
+
+    여러 스레드가 동시에 call()해도 할당량 안에서만 요청이 나갑니다.
+    clock/sleep/rng를 바꿔 넣으면 실제 대기 없이 동작을 확인할 수 있습니다.
+    """
+
+    def __init__(self, rpm, tpm=None, max_retries=4, base_delay=2.0, max_delay=60.0,
+                 breaker_threshold=5, breaker_cooldown=120.0, clock=None, sleep=None, rng=None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.clock = clock or time.monotonic
+        self.sleep = sleep or METRICS.sleep
+        self.rng = rng or random.random
+        self._lock = threading.Lock()
+        self._requests = float(rpm) if rpm else 0.0
+        self._tokens = float(tpm) if tpm else 0.0
+        self._updated = self.clock()
+        self.failures = 0
+        self.open_until = None
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def acquire(self, tokens=0):
+        """요청 1건 + tokens만큼 할당량이 찰 때까지 대기 후 차감"""
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        while True:
+            with self._lock:
+                self._refill(self.clock())
+                wait_sec = 0.0
+                if self.rpm and self._requests < 1:
+                    wait_sec = (1 - self._requests) * 60 / self.rpm
+                if self.tpm and self._tokens < tokens:
+                    wait_sec = max(wait_sec, (tokens - self._tokens) * 60 / self.tpm)
+                if wait_sec <= 0:
+                    if self.rpm:
+                        self._requests -= 1
+                    if self.tpm:
+                        self._tokens -= tokens
+                    return
+            self.sleep(wait_sec)
+
+    def is_open(self):
+        with self._lock:
+            return self.open_until is not None and self.clock() < self.open_until
+
+    def _record(self, ok):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self.open_until = None
+                return
+            self.failures += 1
+            # 쿨다운이 지난 뒤 시험 호출이 실패해도 다시 열림
+            if self.failures >= self.breaker_threshold:
+                self.open_until = self.clock() + self.breaker_cooldown
+
+    def backoff(self, attempt):
+        """지수 백오프 + 지터 (delay/2 ~ delay 사이)"""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay / 2 + self.rng() * delay / 2
+
+    def call(self, func, tokens=0):
+        """할당량을 받아 func() 실행, 429/5xx는 재시도 (서킷이 열려 있으면 CircuitOpenError)"""
+        for attempt in range(self.max_retries + 1):
+            if self.is_open():
+                raise CircuitOpenError("연속 실패로 API 호출 일시 중단")
+            self.acquire(tokens)
+            try:
+                result = func()
+            except Exception as e:
+                self._record(False)
+                if not is_retryable(e) or attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                print(f"   [WARN] API 오류({error_status(e)}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                METRICS.count("api_retries")
+                self.sleep(delay)
+            else:
+                self._record(True)
+                return result
+
+def make_gemini_scheduler():
+    """현재 설정값으로 Gemini 호출 스케줄러 생성"""
+    return RateScheduler(
+        GEMINI_RPM, GEMINI_TPM, max_retries=GEMINI_MAX_RETRIES,
+        breaker_threshold=GEMINI_BREAKER_THRESHOLD, breaker_cooldown=GEMINI_BREAKER_COOLDOWN_SEC,
+    )
+
+GEMINI_SCHEDULER = make_gemini_scheduler()
+
+# ============== 로컬 발췌 (요약 전처리) ==============
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\s*\n+\s*')
+# 기자 이름/이메일, 저작권 문구 등 본문이 아닌 짧은 문장
+_BOILERPLATE = re.compile(r'무단\s*전재|재배포\s*금지|저작권자|ⓒ|©|copyright|[\w.+-]+@[\w-]+\.[\w.]+', re.I)
+# 문장 앞 "[서울=뉴시스] 홍길동 기자 =" 같은 발신지/바이라인
+_DATELINE = re.compile(r'^(?:[\[(][^\])]{1,30}[\])]\s*)?(?:[가-힣]{2,4}\s*(?:기자|특파원)\s*=\s*)?')
+# 이미 고른 문장과 이 이상 비슷한 문장은 발췌에서 제외
+SENTENCE_REDUNDANCY = 0.5
+
+def split_sentences(text):
+    """본문을 문장 단위로 나누고 짧은 조각/기사 외 문구(바이라인, 저작권) 제거"""
+    sentences = []
+    for sentence in _SENTENCE_SPLIT.split(text or ""):
+        sentence = _DATELINE.sub("", sentence.strip())
+        if len(sentence) < 10:
+            continue
+        if len(sentence) < 80 and _BOILERPLATE.search(sentence):
+            continue
+        sentences.append(sentence)
+    return sentences
+
+def score_sentences(sentences, keywords=(), title=""):
+    """(문장 점수, 문장 간 유사도 행렬) 반환
+
+    점수 = TextRank 중심성 + 제목/키워드 유사도 + 앞 문단 가중치 (각각 최댓값 1로 정규화)
+    """
+    n = len(sentences)
+    query = " ".join([title, *keywords])
+    matrix = title_tfidf_matrix(sentences + [query])
+    vectors, query_vector = matrix[:-1], matrix[-1]
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    totals = similarity.sum(axis=1, keepdims=True)
+    totals[totals == 0] = 1.0
+    transition = similarity / totals
+    rank = np.full(n, 1.0 / n)
+    for _ in range(30):
+        rank = 0.15 / n + 0.85 * (transition.T @ rank)
+    relevance = vectors @ query_vector
+    position = 1.0 / (1.0 + np.arange(n))
+
+    def scaled(values):
+        peak = values.max()
+        return values / peak if peak > 0 else values
+
+    return 0.3 * scaled(rank) + 0.5 * scaled(relevance) + 0.2 * position, similarity
+
+def pick_sentences(sentences, scored, token_budget=None, count=None):
+    """점수 높은 문장부터 token_budget(또는 count개) 안에서 골라 원래 순서로 반환 (비슷한 문장은 한 번만)"""
+    scores, similarity = scored
+    chosen, used = [], 0
+    for i in np.argsort(-scores, kind="stable"):
+        tokens = estimate_tokens(sentences[i])
+        if token_budget is not None and chosen and used + tokens > token_budget:
+            continue
+        if chosen and similarity[i, chosen].max() >= SENTENCE_REDUNDANCY:
             continue
-        if source in text_to_check:
-            return score, source
-    return TRUSTED_SOURCES["default"], "기타"
+        chosen.append(i)
+        used += tokens
+        if count is not None and len(chosen) >= count:
+            break
+    return [sentences[i] for i in sorted(chosen)]
+
+def compact_article(text, keywords=(), title="", token_budget=None):
+    """요약 프롬프트에 넣을 본문을 핵심 문장만 남겨 token_budget 안으로 줄임"""
+    token_budget = EXTRACTIVE_TOKEN_BUDGET if token_budget is None else token_budget
+    sentences = split_sentences(text)
+    if not sentences:
+        return text
+    if estimate_tokens(" ".join(sentences)) <= token_budget:
+        return "\n".join(sentences)
+    return "\n".join(pick_sentences(sentences, score_sentences(sentences, keywords, title), token_budget))
+
+def extractive_summary(text, keywords=(), title="", count=3):
+    """API 없이 만든 요약: 점수 높은 문장 count개를 불렛 형식으로"""
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+    chosen = pick_sentences(sentences, score_sentences(sentences, keywords, title), count=count)
+    return "\n".join(f"- {sentence}" for sentence in chosen)
 
 # ============== AI 기능 (Gemini API) ==============
-def call_gemini_api(prompt):
+SUMMARY_CHAR_LIMIT = 3500
+# 요약 프롬프트(SUMMARY_RULES 등)를 바꾸면 올려서 이전 요약 캐시를 무효화
+SUMMARY_PROMPT_VERSION = "1"
+
+_gemini_client = None
+
+def get_gemini_client():
+    """프로세스 전체에서 재사용하는 Gemini 클라이언트 반환"""
+    global _gemini_client
+    with _session_lock:
+        if _gemini_client is None:
+            from google import genai
+            _gemini_client = genai.Client(api_key=GEMINI_API_KEY)
+        return _gemini_client
+
+@instrumented
+def call_gemini_api(prompt, max_output_tokens=500, response_mime_type=None):
     """Gemini API 호출"""
-    if not GEMINI_API_KEY: 
+    if not GEMINI_API_KEY and _gemini_client is None: 
         print("[ERROR] GEMINI_API_KEY가 없습니다.")
+        METRICS.failure("call_gemini_api")
+        return ""
+    if HTTP_CACHE_MODE == "offline":
+        # 오프라인 재실행은 캐시된 요약만 사용
+        METRICS.failure("call_gemini_api")
         return ""
     
-    try:
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        response = client.models.generate_content(
+    def request():
+        from google.genai import types
+        return get_gemini_client().models.generate_content(
             model="gemini-2.0-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
                 temperature=0.5,
-                max_output_tokens=500
+                max_output_tokens=max_output_tokens,
+                response_mime_type=response_mime_type
             )
         )
+
+    try:
+        # 요청 토큰 = 프롬프트 추정치 + 최대 출력 토큰
+        response = GEMINI_SCHEDULER.call(request, tokens=estimate_tokens(prompt) + max_output_tokens)
         return response.text.strip()
+    except CircuitOpenError as e:
+        print(f"[WARN] Gemini API 호출 생략: {e}")
+        METRICS.failure("call_gemini_api")
+        return ""
     except Exception as e:
         print(f"[WARN] Gemini API 오류: {e}")
+        METRICS.failure("call_gemini_api")
         return ""
 
+SUMMARY_RULES = (
+    "조건:\n"
+    "1. 각 문장은 가독성 좋게 불렛포인트(-)로 시작할 것.\n"
+    "2. '핵심:', '배경:' 같은 말머리 단어는 절대 넣지 말고 내용만 작성할 것.\n"
+    "3. '다음은', '아래는', '요약입니다' 같은 서두나 도입 문장 없이 바로 요약 내용만 출력할 것.\n"
+    "4. 한국어로 정중하게 작성할 것.\n\n"
+)
+
 def summarize_article(text: str) -> str:
     """기사 요약 (3줄 형식, 서두/말머리 제거)"""
     prompt = (
         "아래 뉴스 기사를 읽고 중요한 내용을 딱 3문장으로 요약해줘.\n"
-        "조건:\n"
-        "1. 각 문장은 가독성 좋게 불렛포인트(-)로 시작할 것.\n"
-        "2. '핵심:', '배경:' 같은 말머리 단어는 절대 넣지 말고 내용만 작성할 것.\n"
-        "3. '다음은', '아래는', '요약입니다' 같은 서두나 도입 문장 없이 바로 요약 내용만 출력할 것.\n"
-        "4. 한국어로 정중하게 작성할 것.\n\n"
-        f"기사 내용:\n{text[:3500]}"
+        + SUMMARY_RULES +
+        f"기사 내용:\n{text[:SUMMARY_CHAR_LIMIT]}"
     )
     result = call_gemini_api(prompt)
     if result:
@@ -230,25 +1472,296 @@ def summarize_article(text: str) -> str:
             return '\n'.join(filtered)
     return result
 
+def estimate_tokens(text):
+    """프롬프트 토큰 수 대략 추정 (한국어 기준 약 2자당 1토큰)"""
+    return len(text) // 2 + 1
+
+def make_summary_batches(texts, batch_size=None, token_budget=None):
+    """요약할 본문 인덱스를 배치 크기와 토큰 예산 안에서 묶음"""
+    batch_size = SUMMARY_BATCH_SIZE if batch_size is None else batch_size
+    token_budget = SUMMARY_BATCH_TOKEN_BUDGET if token_budget is None else token_budget
+    batches, current, current_tokens = [], [], 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text[:SUMMARY_CHAR_LIMIT])
+        if current and (len(current) >= batch_size or current_tokens + tokens > token_budget):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+def parse_batch_summaries(response, count):
+    """배치 요약 JSON 응답을 {번호: 요약} 형태로 변환 (형식이 틀린 항목은 제외)"""
+    text = response.strip()
+    if text.startswith("```"):
+        text = re.sub(r'^```[a-zA-Z]*\s*|\s*```$', '', text)
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("summaries", [])
+    summaries = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        try:
+            idx = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        bullets = item.get("summary")
+        if not (1 <= idx <= count) or not isinstance(bullets, list):
+            continue
+        bullets = [str(b).strip().lstrip('-').strip() for b in bullets if str(b).strip()]
+        if len(bullets) == 3:
+            summaries[idx] = '\n'.join(f"- {b}" for b in bullets)
+    return summaries
+
+def summarize_batch(texts):
+    """여러 기사를 한 번의 요청으로 요약 (실패한 기사는 결과에서 빠짐)"""
+    articles = "\n\n".join(
+        f"[기사 {i+1}]\n{text[:SUMMARY_CHAR_LIMIT]}" for i, text in enumerate(texts)
+    )
+    prompt = (
+        f"아래 {len(texts)}개의 뉴스 기사를 각각 읽고 중요한 내용을 딱 3문장으로 요약해줘.\n"
+        + SUMMARY_RULES +
+        "출력 형식: JSON 배열만 출력할 것. 각 원소는 {\"id\": 기사 번호, \"summary\": [문장1, 문장2, 문장3]} 형태.\n\n"
+        f"{articles}"
+    )
+    response = call_gemini_api(prompt, max_output_tokens=300 * len(texts) + 100,
+                               response_mime_type="application/json")
+    if not response:
+        return {}
+    try:
+        return parse_batch_summaries(response, len(texts))
+    except Exception as e:
+        print(f"   [WARN] 배치 요약 응답 해석 실패: {e}")
+        return {}
+
+def summarize_articles(texts):
+    """본문 목록 요약 (batch 모드는 배치 응답에서 빠진 기사만 개별 요약으로 대체)
+
+    요청 간격은 GEMINI_SCHEDULER가 맞추므로 배치들을 GEMINI_CONCURRENCY개까지 동시에 보냅니다.
+    """
+    summaries = [""] * len(texts)
+    if SUMMARY_MODE == "batch":
+        batches = make_summary_batches(texts)
+    else:
+        batches = [[i] for i in range(len(texts))]
+
+    def run(batch):
+        if len(batch) > 1:
+            print(f"   [배치 요약] {len(batch)}건 요청...")
+            result = summarize_batch([texts[i] for i in batch])
+            for pos, i in enumerate(batch):
+                summaries[i] = result.get(pos + 1, "")
+        missing = [i for i in batch if not summaries[i]]
+        if len(batch) > 1 and missing:
+            print(f"   [WARN] 배치 응답 누락 {len(missing)}건, 개별 요약으로 대체")
+        for i in missing:
+            summaries[i] = summarize_article(texts[i])
+
+    if GEMINI_CONCURRENCY <= 1 or len(batches) <= 1:
+        for batch in batches:
+            run(batch)
+    else:
+        with ThreadPoolExecutor(max_workers=min(GEMINI_CONCURRENCY, len(batches))) as executor:
+            list(executor.map(run, batches))
+    return summaries
+
+def summary_cache_key(text):
+    """공백을 정규화한 본문 해시 + 프롬프트 버전으로 요약 캐시 키 생성"""
+    normalized = re.sub(r'\s+', ' ', text).strip()
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return f"v{SUMMARY_PROMPT_VERSION}:{digest}"
+
+def get_summary_cache():
+    """data/summary_cache.sqlite3 (본문 해시 -> 요약) 캐시 반환"""
+    return open_cache(SUMMARY_CACHE_PATH, None, SUMMARY_CACHE_MAX_ENTRIES)
+
+def summarize_with_cache(texts, keywords=None, titles=None):
+    """요약 캐시에 있는 본문은 API 호출 없이 재사용하고 나머지만 요약
+
+    캐시 키는 원문 기준이며, API에는 발췌한 핵심 문장만 보냅니다 (EXTRACTIVE_PRESUMMARY).
+    API 요약을 받지 못한 기사는 발췌 요약으로 대체하되 캐시에는 남기지 않아 다음 실행에서 다시 요청합니다.
+    """
+    keywords = keywords or [()] * len(texts)
+    titles = titles or [""] * len(texts)
+    cache = get_summary_cache()
+    keys = [summary_cache_key(text) for text in texts]
+    summaries = [(cache.get(key) if cache is not None else None) or "" for key in keys]
+    misses = [i for i, summary in enumerate(summaries) if not summary]
+    print(f"   [요약 캐시] 적중 {len(texts) - len(misses)}건 / 미적중 {len(misses)}건")
+    METRICS.count("summary_cache_hits", len(texts) - len(misses))
+    METRICS.count("summary_cache_misses", len(misses))
+
+    prompts = [texts[i] for i in misses]
+    if EXTRACTIVE_PRESUMMARY and misses:
+        prompts = [compact_article(texts[i], keywords[i], titles[i]) for i in misses]
+        before = sum(estimate_tokens(texts[i][:SUMMARY_CHAR_LIMIT]) for i in misses)
+        after = sum(estimate_tokens(prompt[:SUMMARY_CHAR_LIMIT]) for prompt in prompts)
+        print(f"   [발췌] 요약 입력 토큰 약 {before:,} → {after:,} ({before - after:,} 절약)")
+        METRICS.count("prompt_tokens_saved", max(0, before - after))
+
+    fallbacks = 0
+    for i, summary in zip(misses, summarize_articles(prompts)):
+        if summary and cache is not None:
+            cache.put(keys[i], summary)
+        if not summary and EXTRACTIVE_FALLBACK:
+            summary = extractive_summary(texts[i], keywords[i], titles[i])
+            fallbacks += bool(summary)
+        summaries[i] = summary
+    if fallbacks:
+        print(f"   [발췌 요약] API 요약을 받지 못한 {fallbacks}건은 본문 핵심 문장으로 대체")
+        METRICS.count("extractive_fallbacks", fallbacks)
+    if cache is not None:
+        cache.evict()
+    return summaries
+
 # ============== 구글 뉴스 URL 변환 ==============
+def get_url_cache():
+    """data/url_cache.sqlite3 (구글 뉴스 URL -> 실제 기사 URL) 캐시 반환"""
+    return open_cache(URL_CACHE_PATH, URL_CACHE_TTL_DAYS, URL_CACHE_MAX_ENTRIES)
+
+@instrumented
 def resolve_google_news_url(google_url: str) -> str:
     """구글 뉴스 리다이렉트 URL을 실제 기사 URL로 변환"""
     if not google_url or "news.google.com" not in google_url:
         return google_url
     
+    cache = get_url_cache()
+    if cache is not None:
+        cached = cache.get(google_url)
+        if cached:
+            METRICS.count("url_cache_hits")
+            return cached
+    
+    if HTTP_CACHE_MODE == "offline":
+        METRICS.failure("resolve_google_news_url")
+        return google_url
+
     try:
-        # googlenewsdecoder 라이브러리 사용
-        result = new_decoderv1(google_url)
+        # googlenewsdecoder 라이브러리 사용 (news.google.com 동시 연결 수 제한)
+        with host_slot(google_url):
+            from googlenewsdecoder import new_decoderv1
+            result = new_decoderv1(google_url)
         if result.get("status"):
+            if cache is not None:
+                cache.put(google_url, result["decoded_url"])
             return result["decoded_url"]
+        METRICS.failure("resolve_google_news_url")
         return google_url
     except Exception as e:
         print(f"[WARN] URL 변환 실패: {e}")
+        METRICS.failure("resolve_google_news_url")
         return google_url
 
+def resolve_google_news_urls(urls, workers=None):
+    """여러 구글 뉴스 URL을 한꺼번에 병렬 변환 (입력 순서 유지)"""
+    workers = DECODE_WORKERS if workers is None else workers
+    if workers <= 1 or len(urls) <= 1:
+        decoded = [resolve_google_news_url(url) for url in urls]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as executor:
+            decoded = list(executor.map(resolve_google_news_url, urls))
+    cache = get_url_cache()
+    if cache is not None:
+        cache.evict()
+    return decoded
+
 # ============== 본문 추출 ==============
-def extract_article_content(url: str) -> str:
-    """URL에서 기사 본문 추출"""
+_CHARSET = re.compile(r'charset=["\']?([A-Za-z0-9_-]+)')
+
+def fetch_html(url):
+    """기사 페이지를 한 번만 다운로드하여 (원본 바이트, Content-Type 헤더의 charset) 반환 (실패 시 (None, None))"""
+    try:
+        resp = http_get(url, cache_ttl=HTTP_CACHE_TTL_HOURS * 3600, verify=False)
+        if resp.status_code == 200 and resp.content:
+            match = _CHARSET.search(resp.headers.get("Content-Type") or "")
+            return resp.content, match.group(1) if match else None
+    except Exception as e:
+        print(f"[WARN] 페이지 다운로드 실패: {e}")
+    return None, None
+
+def extract_text_from_html(html):
+    """다운로드한 HTML 하나로 여러 추출 옵션을 차례로 시도"""
+    if not html:
+        return ""
+    for options in ({"include_comments": False, "include_tables": False},
+                    {"include_comments": False}):
+        try:
+            text = trafilatura.extract(html, **options)
+        except Exception as e:
+            print(f"[WARN] 본문 추출 실패: {e}")
+            return ""
+        if text and len(text) >= 100:
+            return text
+    return ""
+
+_extract_pool = None
+_extract_pool_broken = False
+
+def get_extract_pool():
+    """본문 파싱(trafilatura)용 프로세스 풀 반환 (프로세스 1개 설정이거나 풀을 쓸 수 없으면 None)"""
+    global _extract_pool
+    with _session_lock:
+        if _extract_pool is None and EXTRACT_PROCESSES > 1 and not _extract_pool_broken:
+            # 다운로드 스레드가 떠 있는 상태에서 fork하지 않도록 spawn 사용
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _extract_pool
+
+def shutdown_extract_pool():
+    global _extract_pool
+    with _session_lock:
+        pool, _extract_pool = _extract_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+@instrumented
+def parse_article_html(html):
+    """CPU를 많이 쓰는 본문 파싱을 프로세스 풀에서 실행 (풀 오류 시 현재 스레드에서 실행)"""
+    global _extract_pool_broken
+    pool = get_extract_pool()
+    if pool is not None:
+        try:
+            return pool.submit(extract_text_from_html, html).result()
+        except Exception as e:
+            print(f"[WARN] 본문 추출 프로세스 오류, 스레드에서 추출: {e}")
+            _extract_pool_broken = True
+    return extract_text_from_html(html)
+
+def decode_html(html, charset=None):
+    """HTML 바이트를 디코딩 (HTTP 헤더 charset → meta charset → UTF-8 → CP949 순)
+
+    charset을 헤더에만 적는 EUC-KR/CP949 국내 언론사 페이지가 있어, 선언이 없고 UTF-8이 아니면 CP949로 읽습니다.
+    """
+    if not charset:
+        match = _CHARSET.search(html[:4096].decode("ascii", errors="ignore"))
+        charset = match.group(1) if match else None
+    for encoding in ([charset] if charset else []) + ["utf-8", "cp949"]:
+        try:
+            return html.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return html.decode("utf-8", errors="replace")
+
+def html_mentions(html, keywords, title="", charset=None):
+    """본문 추출 전 사전 필터: 원본 HTML(또는 태그/엔티티 제거본)이나 제목에 키워드 중 하나라도 있는지"""
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if any(kw in title for kw in keywords):
+        return True
+    text = decode_html(html, charset)
+    if any(kw in text for kw in keywords):
+        return True
+    # <b>일학습</b>병행, &#xC77C; 처럼 태그/엔티티로 끊긴 경우
+    text = unescape(re.sub(r'<[^>]+>', '', text))
+    return any(kw in text for kw in keywords)
+
+@instrumented
+def extract_article_content(url: str, keywords=None, title="") -> str:
+    """URL에서 기사 본문 추출 (keywords가 있으면 키워드가 하나도 없는 페이지는 파싱 전에 제외)"""
     if not url: 
         return ""
     
@@ -257,49 +1770,182 @@ def extract_article_content(url: str) -> str:
     if actual_url != url:
         print(f"   [URL 변환] {url[:50]}... -> {actual_url[:50]}...")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    try:
-        # Trafilatura 시도 (변환된 URL 사용)
-        downloaded = trafilatura.fetch_url(actual_url)
-        if downloaded:
-            text = trafilatura.extract(downloaded, include_comments=False, include_tables=False)
-            if text and len(text) >= 100: 
-                return text
-
-        # Requests 시도 (변환된 URL 사용)
-        resp = requests.get(actual_url, headers=headers, timeout=10, verify=False)
-        if resp.status_code == 200:
-            text = trafilatura.extract(resp.text, include_comments=False)
-            if text and len(text) >= 100: 
-                return text
-        return ""
-    except Exception as e:
-        print(f"[WARN] 본문 추출 실패: {e}")
+    html, charset = fetch_html(actual_url)
+    if html and keywords and HTML_PREFILTER and not html_mentions(html, keywords, title, charset):
+        # 본문에도 키워드가 있을 수 없으므로 관련성 체크에서 어차피 제외될 페이지
+        METRICS.count("prefilter_rejected")
         return ""
+    text = parse_article_html(html) if html else ""
+    if not text:
+        METRICS.failure("extract_article_content")
+    return text
+
+def report_prefilter():
+    """사전 필터 제외 건수와 절약된 파싱 시간(평균 파싱 시간 기준 추정) 출력/기록"""
+    rejected = METRICS.counters.get("prefilter_rejected", 0)
+    if not rejected:
+        return
+    parse = METRICS.functions.get("parse_article_html", {})
+    avg = parse["seconds"] / parse["calls"] if parse.get("calls") else 0.0
+    saved = rejected * avg
+    METRICS.count("prefilter_saved_seconds_est", round(saved, 3))
+    print(f"   [사전 필터] 키워드 없는 페이지 {rejected}건 파싱 생략 (약 {saved:.1f}초 절약)")
+
+def extract_articles(urls, workers=None, deadline_sec=None, keywords=None, titles=None):
+    """여러 기사 본문을 병렬 추출 (입력 순서 유지, 전체 제한 시간 초과분은 빈 문자열)
+
+    keywords/titles를 주면 키워드가 없는 페이지는 파싱 전에 제외합니다.
+    """
+    workers = EXTRACT_WORKERS if workers is None else workers
+    deadline_sec = EXTRACT_DEADLINE_SEC if deadline_sec is None else deadline_sec
+    if not urls:
+        return []
+    keywords = keywords or [None] * len(urls)
+    titles = titles or [""] * len(urls)
+    jobs = list(zip(urls, keywords, titles))
+    if workers <= 1:
+        return [extract_article_content(*job) for job in jobs]
+
+    contents = [""] * len(urls)
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(urls)))
+    futures = {executor.submit(extract_article_content, *job): i for i, job in enumerate(jobs)}
+    try:
+        # 도메인별 동시 연결 수는 http_get()의 host_slot()이, 파싱은 프로세스 풀이 처리
+        done, not_done = wait(futures, timeout=deadline_sec)
+        for future in done:
+            try:
+                contents[futures[future]] = future.result()
+            except Exception as e:
+                print(f"[WARN] 본문 추출 실패: {e}")
+        if not_done:
+            print(f"   [WARN] 제한 시간({deadline_sec}초) 초과로 {len(not_done)}건 본문 추출 생략")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return contents
 
 # ============== 구글 뉴스 RSS ==============
-def crawl_google_news(keyword, target_date_str):
-    """구글 뉴스 RSS로 기사 수집"""
+class FeedState:
+    """키워드별 RSS 수집 기준점 (ETag/Last-Modified, 최신 pubDate, 최근 GUID) 저장소"""
+
+    def __init__(self, path, grace_minutes=180):
+        self.path = Path(path)
+        self.grace_sec = grace_minutes * 60
+        self._lock = threading.Lock()
+        self.keywords = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.keywords = json.load(f)
+            except Exception as e:
+                print(f"[WARN] 수집 기준점 로드 실패: {e}")
+
+    def get(self, keyword):
+        with self._lock:
+            return dict(self.keywords.get(keyword, {}))
+
+    def cutoff(self, keyword):
+        """이 시각(epoch)보다 오래된 pubDate 항목은 이미 처리한 것으로 간주"""
+        latest = self.get(keyword).get("latest_pub")
+        return latest - self.grace_sec if latest else None
+
+    def update(self, keyword, etag, last_modified, seen):
+        """새로 본 GUID(-> pubDate epoch)를 반영하고 기준점 밖의 오래된 GUID 정리"""
+        with self._lock:
+            state = self.keywords.setdefault(keyword, {})
+            if etag:
+                state["etag"] = etag
+            if last_modified:
+                state["last_modified"] = last_modified
+            merged = dict(state.get("seen", {}))
+            merged.update(seen)
+            if merged:
+                state["latest_pub"] = max([state.get("latest_pub") or 0] + list(merged.values()))
+                keep_from = state["latest_pub"] - self.grace_sec
+                state["seen"] = {g: ts for g, ts in merged.items() if ts >= keep_from}
+
+    def save(self):
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(self.keywords, f, ensure_ascii=False, indent=1)
+            except Exception as e:
+                print(f"[WARN] 수집 기준점 저장 실패: {e}")
+
+_feed_state = None
+
+def get_feed_state():
+    """data/feed_state.json 수집 기준점 반환"""
+    global _feed_state
+    with _session_lock:
+        if _feed_state is None:
+            _feed_state = FeedState(FEED_STATE_PATH, INCREMENTAL_GRACE_MINUTES)
+        return _feed_state
+
+def parse_pub_timestamp(text):
+    """RSS pubDate -> epoch 초 (해석 실패 시 None)"""
+    if not text:
+        return None
+    try:
+        return parsedate_to_datetime(text).timestamp()
+    except Exception:
+        return None
+
+@instrumented
+def crawl_google_news(keyword, target_date_str, date_bounded=False, raise_errors=False, strip=None):
+    """구글 뉴스 RSS로 기사 수집
+
+    date_bounded면 최근 1일(when:1d) 대신 target_date_str 하루(after:/before:)를 검색하고
+    증분 수집 기준점은 쓰지 않습니다 (백필용). raise_errors면 RSS 오류를 예외로 전달합니다.
+    strip은 정규화 제목(_title_norm)에서 뺄 키워드 목록입니다 (기본: KEYWORDS, 여러 테넌트면 전체 키워드).
+    """
     encoded_keyword = quote(keyword)
-    url = f"https://news.google.com/rss/search?q={encoded_keyword}+when:1d&hl=ko&gl=KR&ceid=KR:ko"
+    if date_bounded:
+        next_day = (datetime.strptime(target_date_str, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        query = f"{encoded_keyword}+after:{target_date_str}+before:{next_day}"
+    else:
+        query = f"{encoded_keyword}+when:1d"
+    url = f"{GOOGLE_NEWS_RSS_BASE}?q={query}&hl=ko&gl=KR&ceid=KR:ko"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
+    # 증분 수집: 지난 응답의 ETag/Last-Modified로 조건부 요청
+    # 날짜 지정 수집과 오프라인 재실행은 수집 기준점(이미 본 기사)과 무관하게 피드 전체를 다시 읽음
+    state = get_feed_state() if INCREMENTAL and not date_bounded and HTTP_CACHE_MODE != "offline" else None
+    headers = {}
+    cutoff = None
+    if state is not None:
+        kw_state = state.get(keyword)
+        if kw_state.get("etag"):
+            headers["If-None-Match"] = kw_state["etag"]
+        if kw_state.get("last_modified"):
+            headers["If-Modified-Since"] = kw_state["last_modified"]
+        seen_guids = kw_state.get("seen", {})
+        cutoff = state.cutoff(keyword)
     
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        # 지난 날짜 검색 결과는 바뀌지 않으므로 응답 캐시 재사용
+        resp = http_get(url, cache_ttl=HTTP_CACHE_TTL_HOURS * 3600 if date_bounded else None, headers=headers)
+        if resp.status_code == 304:
+            print(f"   [{keyword}] 변경 없음 (304)")
+            METRICS.count("rss_not_modified")
+            return []
         resp.raise_for_status()
         root = ET.fromstring(resp.content)
         items = root.findall('.//item')
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"[WARN] [{keyword}] 구글 뉴스 RSS 오류: {e}")
+        METRICS.failure("crawl_google_news")
         return []
     
     rows = []
+    new_seen = {}
+    skipped = 0
+    now_ts = time.time()
     collected_at = pd.Timestamp.now(tz="Asia/Seoul").strftime("%Y-%m-%d %H:%M")
+    if date_bounded:
+        # 백필 기사는 수집시각을 검색한 날짜로 기록 (월별 파티션, 보관 기간, ALL.csv 최신순 정렬이 기사 날짜를 따름)
+        collected_at = f"{target_date_str} 23:59"
     
     for item in items:
         try:
@@ -310,6 +1956,16 @@ def crawl_google_news(keyword, target_date_str):
             
             if title_elem is None or link_elem is None:
                 continue
+            
+            # 기준점 이하(이미 본 GUID 또는 기준 시각 이전) 항목은 정규화/점수 계산 전에 건너뜀
+            if state is not None:
+                guid_elem = item.find('guid')
+                guid = (guid_elem.text if guid_elem is not None else None) or link_elem.text or ""
+                pub_ts = parse_pub_timestamp(pub_date_elem.text if pub_date_elem is not None else None)
+                if guid in seen_guids or (cutoff and pub_ts is not None and pub_ts < cutoff):
+                    skipped += 1
+                    continue
+                new_seen[guid] = pub_ts or now_ts
                 
             title = clean_html(title_elem.text or "")
             link = link_elem.text or ""
@@ -325,86 +1981,530 @@ def crawl_google_news(keyword, target_date_str):
                     pass
             
             # 중복 비교용 제목 정규화
-            norm_title = normalize_title(title)
-            for k in KEYWORDS:
-                norm_title = norm_title.replace(k, "")
+            norm_title = strip_keywords(normalize_title(title), strip or KEYWORDS)
             
             # 신뢰도 점수 계산
-            score, detected_source = get_source_score(link, title + " " + source_name)
+            score, detected_source = SOURCE_RESOLVER.resolve(link, source_name)
             if detected_source == "기타":
                 detected_source = source_name
             
-            rows.append({
+            rows.append(Article({
                 "키워드": keyword,
                 "제목": title,
                 "원문링크": link,
+                "실제링크": "",
                 "출처": detected_source,
                 "신뢰도": score,
                 "발행일(KST)": pub_date_str,
-                "수집시각(KST)": collected_at,
+                # 백필은 그날 발행 시각이 있으면 그 시각으로 (같은 날 기사도 발행 순으로 정렬)
+                "수집시각(KST)": pub_date_str if date_bounded and pub_date_str.startswith(target_date_str)
+                                 else collected_at,
                 "요약": "",
                 "_title_norm": norm_title
-            })
+            }))
             
         except Exception as e:
             continue
     
-    print(f"   [{keyword}] {len(rows)}건 수집")
+    if state is not None:
+        state.update(keyword, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), new_seen)
+        METRICS.count("rss_items_skipped", skipped)
+        if skipped:
+            print(f"   [{keyword}] 이전 수집분 {skipped}건 건너뜀")
+    
+    print(f"   [{keyword}]{f' {target_date_str}' if date_bounded else ''} {len(rows)}건 수집")
     return rows
 
-# ============== 이메일 발송 ==============
-def send_email_report(df_new, target_date_str):
-    """이메일 리포트 발송"""
-    if not EMAIL_USER or not EMAIL_PASSWORD or not ALL_RECEIVERS: 
-        print("[INFO] 이메일 설정 없음, 발송 건너뜀")
-        return
-    if df_new.empty: 
-        return
+def collect_news(keywords, target_date_str, workers=None):
+    """키워드별 RSS 수집 (workers > 1이면 병렬, 결과는 키워드 순서 유지)
 
-    receivers = ALL_RECEIVERS
-    subject = f"[뉴스리포트] {target_date_str} 주요 뉴스 알림"
+    정규화 제목에서는 수집하는 키워드 전체를 제거하므로, 여러 테넌트의 키워드를 함께 넘기면
+    어느 테넌트의 키워드든 모든 테넌트의 제목 비교에서 같게 빠집니다.
+    """
+    workers = RSS_WORKERS if workers is None else workers
+    if workers <= 1 or len(keywords) <= 1:
+        raw_rows = []
+        for kw in keywords:
+            raw_rows.extend(crawl_google_news(kw, target_date_str, strip=keywords))
+            rate_limit_sleep(0.3)
+        return raw_rows
 
-    html_body = f"""
-    <div style="font-family: 'Malgun Gothic', sans-serif; background-color: #f4f4f4; padding: 20px; color: #333;">
-        <div style="max-width: 700px; margin: 0 auto; background-color: #ffffff; padding: 30px; border-radius: 10px; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-            <div style="text-align: center; margin-bottom: 30px; border-bottom: 2px solid #555; padding-bottom: 20px;">
-                <h1 style="color: #2c3e50; font-size: 24px; margin: 0;">{target_date_str} 뉴스 리포트</h1>
-                <p style="color: #7f8c8d; font-size: 14px; margin-top: 10px;">
-                    총 <span style="color:#e67e22; font-weight:bold;">{len(df_new)}</span>건의 기사 요약
-                </p>
-            </div>
+    # executor.map은 입력 순서대로 결과를 돌려주므로 출력 순서가 결정적
+    with ThreadPoolExecutor(max_workers=min(workers, len(keywords))) as executor:
+        results = executor.map(lambda kw: crawl_google_news(kw, target_date_str, strip=keywords), keywords)
+        raw_rows = []
+        for rows in results:
+            raw_rows.extend(rows)
+    return raw_rows
+
+# ============== 기사 저장소 ==============
+class ArticleStore:
+    """월별 SQLite 파티션(data/store/YYYY-MM.sqlite3)에 기사를 추가만 하는 저장소"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def partitions(self):
+        return sorted(self.root.glob("*.sqlite3"))
+
+    def is_empty(self):
+        return not self.partitions()
+
+    def _connect(self, path):
+        conn = sqlite3.connect(str(path))
+        col_defs = ", ".join(f'"{c}" TEXT' for c in ARTICLE_COLS)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS articles (seq INTEGER PRIMARY KEY AUTOINCREMENT, {col_defs})")
+        conn.execute("CREATE TABLE IF NOT EXISTS batches (id TEXT PRIMARY KEY)")
+        # 이후 추가된 컬럼은 기존 파티션에 빈 컬럼으로 추가
+        existing = {info[1] for info in conn.execute("PRAGMA table_info(articles)")}
+        for col in ARTICLE_COLS:
+            if col not in existing:
+                conn.execute(f'ALTER TABLE articles ADD COLUMN "{col}" TEXT DEFAULT \'\'')
+        return conn
+
+    @staticmethod
+    def partition_key(collected_at):
+        """수집시각(KST) 'YYYY-MM-DD HH:MM' -> 'YYYY-MM'"""
+        month = str(collected_at)[:7]
+        if re.fullmatch(r'\d{4}-\d{2}', month):
+            return month
+        return pd.Timestamp.now(tz="Asia/Seoul").strftime("%Y-%m")
+
+    def append(self, df, batch=None):
+        """새 기사만 해당 월 파티션 끝에 추가
+
+        batch(실행 ID)를 주면 기사와 함께 같은 트랜잭션에 기록하고, 이미 기록된 파티션은 건너뜁니다.
+        (추가 직후 중단된 실행을 이어서 처리해도 같은 기사가 두 번 들어가지 않음)
+        """
+        if df.empty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        df = df.reindex(columns=ARTICLE_COLS).fillna("").astype(str)
+        months = df["수집시각(KST)"].map(self.partition_key)
+        placeholders = ", ".join("?" for _ in ARTICLE_COLS)
+        col_names = ", ".join(f'"{c}"' for c in ARTICLE_COLS)
+        for month, part in df.groupby(months, sort=True):
+            with closing(self._connect(self.root / f"{month}.sqlite3")) as conn:
+                if batch and conn.execute("SELECT 1 FROM batches WHERE id = ?", (batch,)).fetchone():
+                    continue
+                conn.executemany(f"INSERT INTO articles ({col_names}) VALUES ({placeholders})",
+                                 part.itertuples(index=False, name=None))
+                if batch:
+                    conn.execute("INSERT INTO batches VALUES (?)", (batch,))
+                conn.commit()
+
+    def read(self, columns=None):
+        """필요한 컬럼만 모든 파티션에서 저장 순서대로 읽음"""
+        columns = columns or ARTICLE_COLS
+        col_names = ", ".join(f'"{c}"' for c in columns)
+        frames = []
+        for path in self.partitions():
+            with closing(self._connect(path)) as conn:
+                frames.append(pd.read_sql_query(f"SELECT {col_names} FROM articles ORDER BY seq", conn))
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def import_csv(self, csv_path):
+        """기존 ALL.csv 이력을 저장소로 옮김 (최초 1회)"""
+        df = pd.read_csv(csv_path, dtype=str, encoding="utf-8-sig")
+        self.append(df)
+        return len(df)
+
+    def export_csv(self, csv_path):
+        """기존 형식의 ALL.csv(최신순, 제목 중복 제거) 생성"""
+        df = self.read()
+        df = df.drop_duplicates(subset=["_title_norm"], keep="last")
+        df = df.sort_values("수집시각(KST)", ascending=False, kind="stable")
+        df[DISPLAY_COLS].to_csv(csv_path, index=False, encoding="utf-8-sig")
+        return len(df)
+
+    def renormalize(self, keywords=()):
+        """정규화 규칙이 바뀌었을 때 전체 이력의 _title_norm을 다시 계산 (전체 행 수, 바뀐 행 수 반환)"""
+        total = changed = 0
+        for path in self.partitions():
+            with closing(self._connect(path)) as conn:
+                # 제목을 pyarrow 문자열로 읽어 normalize_titles가 벡터 연산 경로를 타도록 함
+                part = pd.read_sql_query('SELECT seq, "제목", "_title_norm" FROM articles', conn,
+                                         dtype={"제목": "string[pyarrow]"})
+                norms = normalize_titles(part["제목"], keywords)
+                diff = (norms != part["_title_norm"].fillna("")).to_numpy(dtype=bool)
+                conn.executemany('UPDATE articles SET "_title_norm" = ? WHERE seq = ?',
+                                 zip(norms[diff], part["seq"][diff].astype(int).tolist()))
+                conn.commit()
+            total += len(part)
+            changed += int(diff.sum())
+        return total, changed
+
+    def compact(self, retention_months=None):
+        """보관 기간이 지난 파티션 삭제 + 제목 중복 행 정리(최신 행 유지) 후 VACUUM"""
+        removed_partitions = 0
+        if retention_months:
+            cutoff = (pd.Timestamp.now(tz="Asia/Seoul").tz_localize(None).to_period("M")
+                      - retention_months).strftime("%Y-%m")
+            for path in self.partitions():
+                if path.stem < cutoff:
+                    path.unlink()
+                    removed_partitions += 1
+
+        frames = []
+        for path in self.partitions():
+            with closing(self._connect(path)) as conn:
+                part = pd.read_sql_query('SELECT seq, "_title_norm" FROM articles ORDER BY seq', conn)
+            part["partition"] = path.name
+            frames.append(part)
+        removed_rows = 0
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+            df = df[df["_title_norm"].fillna("") != ""]
+            dups = df[df.duplicated(subset=["_title_norm"], keep="last")]
+            for name, part in dups.groupby("partition"):
+                with closing(self._connect(self.root / name)) as conn:
+                    conn.executemany("DELETE FROM articles WHERE seq = ?", [(int(seq),) for seq in part["seq"]])
+                    conn.commit()
+            removed_rows = len(dups)
+        for path in self.partitions():
+            with closing(self._connect(path)) as conn:
+                conn.execute("VACUUM")
+        return removed_partitions, removed_rows
+
+def get_article_store(data_dir=None):
+    """기사 저장소 반환 (비어 있으면 기존 ALL.csv 이력을 먼저 옮김)"""
+    store = ArticleStore(STORE_DIR if data_dir is None else Path(data_dir) / "store")
+    all_path = (DATA_DIR if data_dir is None else Path(data_dir)) / "ALL.csv"
+    if store.is_empty() and all_path.exists():
+        count = store.import_csv(all_path)
+        print(f"[INFO] ALL.csv 이력 {count}건을 저장소로 이전")
+    return store
+
+# ============== 일별 집계 ==============
+class DailyStats:
+    """일자/키워드/출처별 기사 수와 신뢰도 합계 (data/aggregates.sqlite3)
+
+    STEP 6에서 새로 저장한 기사만 더하므로, 추이 조회 시 전체 이력을 다시 읽지 않습니다.
+    이력과 어긋나면(compact, 수동 수정) rebuild()로 저장소에서 다시 계산합니다.
     """
 
-    grouped = df_new.groupby("키워드")
-    for kw in KEYWORDS:
-        if kw in grouped.groups:
-            group_df = grouped.get_group(kw)
-            group_df = group_df.sort_values("신뢰도", ascending=False)
-            kw_color = KEYWORD_COLORS.get(kw, "#333333")
-            
-            html_body += f"""
-            <div style="margin-bottom: 30px;">
-                <div style="background-color: {kw_color}; color: white; padding: 6px 15px; display: inline-block; border-radius: 15px; font-weight: bold; font-size: 16px; margin-bottom: 15px;">
-                    # {kw}
-                </div>
-            """
-            for idx, row in group_df.iterrows():
-                title = row['제목']
-                link = row['원문링크']
-                date = row['발행일(KST)']
-                summary = row['요약']
-                source = row.get('출처', '기타')
-                score = row.get('신뢰도', 50)
-                summary_html = summary.replace('\n', '<br>')
-                
-                if score >= 90:
-                    badge_color = "#27ae60"
-                elif score >= 70:
-                    badge_color = "#3498db"
-                else:
-                    badge_color = "#95a5a6"
-                
-                html_body += f"""
+    COLUMNS = ["date", "keyword", "source", "articles", "score_sum"]
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.path))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_stats ("
+            "date TEXT NOT NULL, keyword TEXT NOT NULL, source TEXT NOT NULL, "
+            "articles INTEGER NOT NULL, score_sum REAL NOT NULL, "
+            "PRIMARY KEY (date, keyword, source)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS batches (id TEXT PRIMARY KEY)")
+        return conn
+
+    @staticmethod
+    def rollup(df):
+        """기사 DataFrame → (date, keyword, source)별 기사 수/신뢰도 합계"""
+        if df.empty:
+            return pd.DataFrame(columns=DailyStats.COLUMNS)
+        published = df["발행일(KST)"].fillna("").astype(str).str[:10]
+        collected = df["수집시각(KST)"].fillna("").astype(str).str[:10]
+        dates = published.where(published.str.fullmatch(r"\d{4}-\d{2}-\d{2}"), collected)
+        sources = df["출처"].fillna("").astype(str).replace("", "기타")
+        # 예전 ALL.csv에서 옮긴 행은 신뢰도가 비어 있으므로 출처 점수로 채움
+        scores = pd.to_numeric(df["신뢰도"], errors="coerce") if "신뢰도" in df.columns else pd.Series(np.nan, index=df.index)
+        scores = scores.fillna(sources.map(SOURCE_RESOLVER.scores)).fillna(SOURCE_RESOLVER.default_score)
+        grouped = pd.DataFrame({
+            "date": dates, "keyword": df["키워드"].fillna("").astype(str), "source": sources, "score": scores,
+        }).groupby(["date", "keyword", "source"], sort=True)["score"].agg(["size", "sum"])
+        return grouped.reset_index().rename(columns={"size": "articles", "sum": "score_sum"})
+
+    def add(self, df, batch=None):
+        """새로 저장한 기사들을 집계에 더함 (batch를 주면 이미 더한 실행은 건너뜀)"""
+        rows = self.rollup(df)
+        if rows.empty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            if batch and conn.execute("SELECT 1 FROM batches WHERE id = ?", (batch,)).fetchone():
+                return
+            if batch:
+                conn.execute("INSERT INTO batches VALUES (?)", (batch,))
+            conn.executemany(
+                "INSERT INTO daily_stats VALUES (?, ?, ?, ?, ?) ON CONFLICT(date, keyword, source) DO UPDATE SET "
+                "articles = articles + excluded.articles, score_sum = score_sum + excluded.score_sum",
+                rows[self.COLUMNS].itertuples(index=False, name=None),
+            )
+            conn.commit()
+
+    def rebuild(self, store):
+        """저장소 전체 이력에서 집계를 다시 계산 (행 수 반환)"""
+        rows = self.rollup(store.read(["키워드", "출처", "신뢰도", "발행일(KST)", "수집시각(KST)"]))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM daily_stats")
+            conn.execute("DELETE FROM batches")
+            conn.executemany("INSERT INTO daily_stats VALUES (?, ?, ?, ?, ?)",
+                             rows[self.COLUMNS].itertuples(index=False, name=None))
+            conn.commit()
+        return len(rows)
+
+    def read(self, since=None):
+        """since(YYYY-MM-DD) 이후 집계 행"""
+        if not self.path.exists():
+            return pd.DataFrame(columns=self.COLUMNS)
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query("SELECT * FROM daily_stats WHERE date >= ? ORDER BY date",
+                                     conn, params=(since or "",))
+
+def get_daily_stats(store, data_dir=None):
+    """집계 반환 (집계 파일이 없고 이력이 있으면 처음 한 번 이력에서 계산)"""
+    stats = DailyStats(STATS_PATH if data_dir is None else Path(data_dir) / STATS_PATH.name)
+    if not stats.path.exists() and not store.is_empty():
+        count = stats.rebuild(store)
+        print(f"[INFO] 이력에서 일별 집계 생성 ({count}행)")
+    return stats
+
+def weekly_trend(stats_df, keywords=None, weeks=4, end=None):
+    """end(기본: 마지막 집계일)까지 최근 weeks주 키워드별 주간 기사 수 (행: 주 시작 월요일, 열: 키워드)"""
+    df = stats_df if keywords is None else stats_df[stats_df["keyword"].isin(keywords)]
+    dates = pd.to_datetime(df["date"], errors="coerce")
+    if dates.isna().all():
+        return pd.DataFrame()
+    end = pd.Timestamp(end) if end is not None else dates.max()
+    week_index = pd.date_range(end=end - pd.Timedelta(days=end.weekday()), periods=weeks, freq="7D")
+    week_start = dates - pd.to_timedelta(dates.dt.weekday, unit="D")
+    recent = week_start.between(week_index[0], week_index[-1]).to_numpy()
+    if not recent.any():
+        return pd.DataFrame()
+    trend = df[recent].pivot_table(index=week_start[recent], columns="keyword", values="articles",
+                                   aggfunc="sum", fill_value=0)
+    trend = trend.reindex(index=week_index, columns=keywords or trend.columns, fill_value=0)
+    trend.index = trend.index.strftime("%m/%d")
+    trend.index.name, trend.columns.name = "주", None
+    return trend
+
+def top_sources(stats_df, count=5):
+    """기사 수 상위 출처 (기사 수, 평균 신뢰도)"""
+    if stats_df.empty:
+        return pd.DataFrame(columns=["articles", "avg_score"])
+    totals = stats_df.groupby("source")[["articles", "score_sum"]].sum()
+    totals["avg_score"] = (totals["score_sum"] / totals["articles"]).round(1)
+    return totals.sort_values("articles", ascending=False).head(count)[["articles", "avg_score"]]
+
+SCORE_BANDS = (("90점 이상", 90, float("inf")), ("70~89점", 70, 90), ("50~69점", 50, 70), ("50점 미만", float("-inf"), 50))
+
+def score_distribution(stats_df):
+    """신뢰도 구간별 기사 수 (집계 행의 평균 점수를 기사 수로 가중)"""
+    if stats_df.empty:
+        return {label: 0 for label, _, _ in SCORE_BANDS}
+    articles = stats_df["articles"].to_numpy(dtype=float)
+    average = stats_df["score_sum"].to_numpy(dtype=float) / np.maximum(articles, 1)
+    return {label: int(articles[(average >= low) & (average < high)].sum()) for label, low, high in SCORE_BANDS}
+
+# ============== 실행 저널 ==============
+class RunJournal:
+    """타겟 날짜별 실행 진행 기록 (기사별 단계 + 실행 단계) — 중단된 실행을 이어서 처리
+
+    기사 단계: collected → deduped → extracted → summarized (제외된 기사는 dropped)
+    실행 단계(progress): collected → deduped (실행이 끝나면 저널 파일 삭제)
+    테넌트별 선택 기사는 tenants 메타에, 발송/저장 완료는 emailed:<이름> / saved:<이름> 메타에 기록합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "key TEXT PRIMARY KEY, seq INTEGER NOT NULL, stage TEXT NOT NULL, "
+            "data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    @staticmethod
+    def key(row):
+        return f"{row['키워드']}|{row['원문링크']}"
+
+    def get_meta(self, name):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, value))
+            self._conn.commit()
+
+    @property
+    def run_id(self):
+        """이 저널(실행)의 고유 ID — 저장소/집계에 같은 기사를 두 번 더하지 않기 위한 표식"""
+        run_id = self.get_meta("run_id")
+        if run_id is None:
+            run_id = uuid.uuid4().hex
+            self.set_meta("run_id", run_id)
+        return run_id
+
+    @property
+    def progress(self):
+        return self.get_meta("progress")
+
+    @progress.setter
+    def progress(self, value):
+        self.set_meta("progress", value)
+
+    def record_many(self, rows, stage):
+        """rows를 주어진 순서(seq)로 stage 단계에 기록"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?)",
+                [(self.key(row), seq, stage, json.dumps(dict(row), ensure_ascii=False, default=str), now)
+                 for seq, row in enumerate(rows)],
+            )
+            self._conn.commit()
+
+    def record(self, row, stage):
+        """기사 한 건의 단계를 갱신 (순서는 유지)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE articles SET stage = ?, data = ?, updated_at = ? WHERE key = ?",
+                (stage, json.dumps(dict(row), ensure_ascii=False, default=str), time.time(), self.key(row)),
+            )
+            self._conn.commit()
+
+    def rows(self, *stages):
+        """해당 단계 기사들을 기록 순서대로 반환"""
+        marks = ",".join("?" * len(stages))
+        with self._lock:
+            found = self._conn.execute(
+                f"SELECT data FROM articles WHERE stage IN ({marks}) ORDER BY seq", stages
+            ).fetchall()
+        return [Article(json.loads(data)) for (data,) in found]
+
+    def finish(self):
+        """실행 완료: 저널을 닫고 파일 삭제 (같은 날짜로 다시 실행하면 새로 시작)"""
+        with self._lock:
+            self._conn.close()
+        if self.path != ":memory:":
+            try:
+                Path(self.path).unlink()
+            except OSError as e:
+                print(f"[WARN] 실행 저널 삭제 실패: {e}")
+
+def open_run_journal(target_date_str):
+    """data/journal/run_YYYY-MM-DD.sqlite3 저널 반환 (오래된 저널은 정리, 열 수 없으면 메모리 저널)"""
+    try:
+        JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+        expire_before = time.time() - JOURNAL_RETENTION_DAYS * 86400
+        for old in JOURNAL_DIR.glob("run_*.sqlite3"):
+            if old.stat().st_mtime < expire_before:
+                old.unlink()
+        return RunJournal(str(JOURNAL_DIR / f"run_{target_date_str}.sqlite3"))
+    except Exception as e:
+        print(f"[WARN] 실행 저널 사용 불가 (이어서 실행 불가): {e}")
+        return RunJournal(":memory:")
+
+# ============== 테넌트 ==============
+class Tenant:
+    """설정 파일 하나(키워드/수신자/이력)에 해당하는 리포트 대상
+
+    여러 테넌트를 한 번에 실행하면 수집/그룹화/URL 변환/본문 추출/요약은 한 번만 하고,
+    이력 대비 중복 제거, 키워드당 기사 수 제한, 이메일 발송, 저장은 테넌트별로 합니다.
+    """
+
+    def __init__(self, name, data_dir, keywords, colors, receivers,
+                 similarity_threshold=0.5, max_articles=50):
+        self.name = name
+        self.data_dir = Path(data_dir)
+        self.keywords = list(keywords)
+        self.colors = colors
+        self.receivers = receivers
+        self.similarity_threshold = similarity_threshold
+        self.max_articles = max_articles
+        self.store = None
+        self.history_index = None
+        self.stats = None
+
+    @classmethod
+    def default(cls):
+        """config.json(과 환경변수 수신자) 기준 기본 테넌트 — 이력은 data/에 저장"""
+        return cls("default", DATA_DIR, KEYWORDS, KEYWORD_COLORS, ALL_RECEIVERS,
+                   SIMILARITY_THRESHOLD, MAX_ARTICLES)
+
+    @classmethod
+    def from_config(cls, name, config, data_dir):
+        settings = config["settings"]
+        return cls(
+            name, data_dir,
+            [kw["name"] for kw in config["keywords"] if kw.get("enabled", True)],
+            {kw["name"]: kw.get("color", "#333333") for kw in config["keywords"]},
+            receiver_subscriptions(config),
+            settings.get("similarity_threshold", 0.5),
+            settings.get("max_articles_per_keyword", 50),
+        )
+
+    @property
+    def title_index_path(self):
+        return self.data_dir / TITLE_INDEX_PATH.name
+
+    def load_history(self, dedup=True):
+        """테넌트 저장소와 제목 색인 로드 (dedup=False면 이력 없이 빈 제목 색인 사용)"""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.store = get_article_store(self.data_dir)
+        if dedup:
+            self.history_index = load_title_index(self.store.read(DEDUP_COLS), self.title_index_path)
+        else:
+            self.history_index = TitleIndex()
+        self.stats = get_daily_stats(self.store, self.data_dir)
+
+def load_tenants(config, paths=None):
+    """기본 테넌트 + 추가 테넌트 목록 (paths가 있으면 config["tenants"] 대신 사용)
+
+    config["tenants"] 항목: {"name": 이름, "config": 설정 파일 경로, "data_dir": 이력 디렉터리(선택)}
+    data_dir를 생략하면 data/tenants/<이름>/에 이력을 저장합니다.
+    """
+    tenants = [Tenant.default()]
+    entries = [{"config": path} for path in paths] if paths else config.get("tenants", [])
+    for entry in entries:
+        path = Path(entry["config"])
+        name = entry.get("name") or path.stem
+        if not path.exists():
+            print(f"[WARN] 테넌트 설정 파일 없음, 건너뜀: {path}")
+            continue
+        if any(tenant.name == name for tenant in tenants):
+            print(f"[WARN] 테넌트 이름 중복, 건너뜀: {name}")
+            continue
+        data_dir = entry.get("data_dir") or DATA_DIR / "tenants" / name
+        tenants.append(Tenant.from_config(name, load_config(path), data_dir))
+    return tenants
+
+# ============== 이메일 발송 ==============
+def render_article_card(row, kw, keyword_colors):
+    """기사 카드 HTML (kw 섹션에 넣을 때 기준)"""
+    title = row['제목']
+    link = row['원문링크']
+    date = row['발행일(KST)']
+    summary = row['요약']
+    source = row.get('출처', '기타')
+    score = row.get('신뢰도', 50)
+    kw_color = keyword_colors.get(kw, "#333333")
+    summary_html = summary.replace('\n', '<br>')
+    # 다른 키워드로도 검색된 기사는 함께 표시
+    other_keywords = [k.strip() for k in str(row.get('관련키워드') or '').split(',')
+                      if k.strip() and k.strip() != kw]
+    keyword_tags = "".join(
+        f' <span style="color: {keyword_colors.get(k, "#95a5a6")};">#{k}</span>' for k in other_keywords
+    )
+    
+    if score >= 90:
+        badge_color = "#27ae60"
+    elif score >= 70:
+        badge_color = "#3498db"
+    else:
+        badge_color = "#95a5a6"
+    
+    return f"""
                 <div style="border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px; margin-bottom: 15px; background-color: #fff;">
                     <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 8px;">
                         <a href="{link}" target="_blank" style="font-size: 18px; font-weight: bold; color: #2c3e50; text-decoration: none; line-height: 1.4; flex: 1;">
@@ -414,7 +2514,7 @@ def send_email_report(df_new, target_date_str):
                             {source}
                         </span>
                     </div>
-                    <div style="font-size: 12px; color: #95a5a6; margin-bottom: 15px;">{date}</div>
+                    <div style="font-size: 12px; color: #95a5a6; margin-bottom: 15px;">{date}{keyword_tags}</div>
                     <div style="background-color: #f9f9f9; padding: 15px; border-left: 4px solid {kw_color}; color: #555; font-size: 14px; line-height: 1.6; border-radius: 4px;">
                         {summary_html}
                     </div>
@@ -425,211 +2525,1012 @@ def send_email_report(df_new, target_date_str):
                     </div>
                 </div>
                 """
-            html_body += '</div>'
 
-    html_body += """
+def render_digest(sections, keyword_colors, target_date_str, trend=""):
+    """[(키워드, [카드 HTML])] 섹션들(+ 주간 추이 HTML)로 리포트 HTML 조립"""
+    count = sum(len(cards) for _, cards in sections)
+    parts = [f"""
+    <div style="font-family: 'Malgun Gothic', sans-serif; background-color: #f4f4f4; padding: 20px; color: #333;">
+        <div style="max-width: 700px; margin: 0 auto; background-color: #ffffff; padding: 30px; border-radius: 10px; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
+            <div style="text-align: center; margin-bottom: 30px; border-bottom: 2px solid #555; padding-bottom: 20px;">
+                <h1 style="color: #2c3e50; font-size: 24px; margin: 0;">{target_date_str} 뉴스 리포트</h1>
+                <p style="color: #7f8c8d; font-size: 14px; margin-top: 10px;">
+                    총 <span style="color:#e67e22; font-weight:bold;">{count}</span>건의 기사 요약
+                </p>
+            </div>
+    """]
+    for kw, cards in sections:
+        parts.append(f"""
+            <div style="margin-bottom: 30px;">
+                <div style="background-color: {keyword_colors.get(kw, "#333333")}; color: white; padding: 6px 15px; display: inline-block; border-radius: 15px; font-weight: bold; font-size: 16px; margin-bottom: 15px;">
+                    # {kw}
+                </div>
+            """)
+        parts.extend(cards)
+        parts.append('</div>')
+    parts.append(trend)
+    parts.append("""
             <div style="text-align: center; margin-top: 40px; font-size: 12px; color: #bdc3c7; border-top: 1px solid #eee; padding-top: 20px;">
                 Automated by GitHub Actions
             </div>
         </div>
     </div>
+    """)
+    return "".join(parts)
+
+def render_trend_section(stats_df, keywords, keyword_colors, end=None):
+    """구독 키워드의 주간 기사 수 추이 + 주요 출처 + 신뢰도 분포 HTML (집계가 없으면 빈 문자열)"""
+    stats_df = stats_df[stats_df["keyword"].isin(keywords)]
+    trend = weekly_trend(stats_df, keywords, TREND_WEEKS, end)
+    if trend.empty:
+        return ""
+    cell = "padding: 4px 8px; border-bottom: 1px solid #eee; text-align: right;"
+    header = "".join(
+        f'<th style="{cell} color: {keyword_colors.get(kw, "#333333")};">{kw}</th>' for kw in trend.columns)
+    body = "".join(
+        f'<tr><td style="{cell} text-align: left; color: #7f8c8d;">{week}~</td>'
+        + "".join(f'<td style="{cell}">{int(count)}</td>' for count in counts) + '</tr>'
+        for week, counts in zip(trend.index, trend.to_numpy()))
+    since = (pd.Timestamp(end or stats_df["date"].max()) - pd.Timedelta(weeks=TREND_WEEKS)).strftime("%Y-%m-%d")
+    recent = stats_df[stats_df["date"] > since]
+    sources = ", ".join(f"{name} {int(row.articles)}건" for name, row in top_sources(recent).iterrows())
+    bands = " · ".join(f"{label} {count}건" for label, count in score_distribution(recent).items())
+    return f"""
+            <div style="margin-top: 30px; padding: 15px; background-color: #fafafa; border-radius: 8px; font-size: 13px;">
+                <div style="font-weight: bold; font-size: 15px; margin-bottom: 10px;">최근 {len(trend)}주 키워드별 기사 수</div>
+                <table style="border-collapse: collapse; width: 100%;">
+                    <tr><th style="{cell} text-align: left;">주</th>{header}</tr>{body}
+                </table>
+                <p style="margin: 10px 0 0; color: #555;">주요 출처: {sources}</p>
+                <p style="margin: 5px 0 0; color: #555;">신뢰도 분포: {bands}</p>
+            </div>
     """
 
+def build_digests(rows, keywords, keyword_colors, receivers, target_date_str, trend_stats=None):
+    """구독 키워드가 같은 수신자끼리 묶어 [(리포트 HTML, 수신자 목록)] 반환
+
+    기사는 구독한 키워드 중 기사가 검색된 첫 키워드 섹션에 들어가며, 카드 HTML은
+    (기사, 섹션)마다 한 번만 만들어 여러 리포트가 함께 씁니다.
+    trend_stats(일별 집계 행)를 주면 구독 키워드의 주간 추이를 리포트 끝에 붙입니다.
+    """
+    rows = sorted(rows, key=lambda row: row.get("신뢰도", 50), reverse=True)
+    row_keywords = [[k.strip() for k in str(row.get("관련키워드") or row["키워드"]).split(",") if k.strip()]
+                    for row in rows]
+    cards = {}
+
+    def card(i, kw):
+        if (i, kw) not in cards:
+            cards[(i, kw)] = render_article_card(rows[i], kw, keyword_colors)
+        return cards[(i, kw)]
+
+    by_subscription = {}
+    for addr, subscribed in receivers.items():
+        key = tuple(kw for kw in keywords if subscribed is None or kw in subscribed)
+        by_subscription.setdefault(key, []).append(addr)
+
+    digests = []
+    for subscribed, addrs in by_subscription.items():
+        sections = {kw: [] for kw in subscribed}
+        for i, kws in enumerate(row_keywords):
+            section = next((kw for kw in kws if kw in sections), None)
+            if section is not None:
+                sections[section].append(card(i, section))
+        sections = [(kw, section_cards) for kw, section_cards in sections.items() if section_cards]
+        if sections:
+            trend = ("" if trend_stats is None
+                     else render_trend_section(trend_stats, list(subscribed), keyword_colors, target_date_str))
+            digests.append((render_digest(sections, keyword_colors, target_date_str, trend), addrs))
+    return digests
+
+def smtp_connect():
+    """메일 서버에 연결하고 (지원하면) STARTTLS/로그인"""
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+    server.ehlo()
+    if SMTP_STARTTLS:
+        server.starttls()
+        # STARTTLS 후에는 서버 기능 목록이 초기화되므로 다시 EHLO (AUTH는 보통 이때 광고됨)
+        server.ehlo()
+    if server.has_extn("auth"):
+        server.login(EMAIL_USER, EMAIL_PASSWORD)
+    return server
+
+def send_messages(messages):
+    """[(수신자, 메시지 문자열)]을 SMTP 연결 하나로 발송하고 성공 건수 반환
+
+    연결이 끊기거나 일시 오류(4xx)면 다시 연결해 SMTP_MAX_RETRIES번까지 재시도하고,
+    수신 거부 같은 영구 오류는 그 수신자만 건너뜁니다. 로그인 실패는 전체 발송을 중단합니다.
+    """
+    server = None
+    sent = 0
     try:
+        for addr, text in messages:
+            for attempt in range(SMTP_MAX_RETRIES + 1):
+                try:
+                    if server is None:
+                        server = smtp_connect()
+                    server.sendmail(EMAIL_USER, [addr], text)
+                    sent += 1
+                    break
+                except smtplib.SMTPAuthenticationError as e:
+                    print(f"[ERROR] 메일 서버 로그인 실패: {e}")
+                    METRICS.failure("send_email_report")
+                    return sent
+                except (smtplib.SMTPException, OSError) as e:
+                    code = getattr(e, "smtp_code", None)
+                    transient = code is None or 400 <= code < 500
+                    if isinstance(e, smtplib.SMTPRecipientsRefused) or not transient or attempt == SMTP_MAX_RETRIES:
+                        print(f"[ERROR] 이메일 발송 실패 ({addr}): {e}")
+                        METRICS.failure("send_email_report")
+                        break
+                    # 응답 코드가 있는 오류는 연결이 살아 있으므로 그대로 재사용 (421은 서버가 끊음)
+                    if server is not None and (code is None or code == 421):
+                        try:
+                            server.close()
+                        except Exception:
+                            pass
+                        server = None
+                    print(f"   [WARN] 이메일 발송 재시도 ({addr}, {attempt + 1}/{SMTP_MAX_RETRIES}): {e}")
+                    METRICS.sleep(2 ** attempt)
+    finally:
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                pass
+    return sent
+
+@instrumented
+def send_email_report(df_new, target_date_str, tenant=None):
+    """이메일 리포트 발송 후 발송 성공 건수 반환 (tenant를 주면 그 테넌트의 수신자/키워드 순서/색상 사용)
+
+    수신자별로 구독 키워드(config.json receivers의 "keywords")에 맞춘 리포트를 한 통씩 보냅니다.
+    보낼 메일이 없으면(이메일 설정 없음, 구독 키워드에 맞는 기사 없음) None을 반환합니다.
+    """
+    receivers = tenant.receivers if tenant else ALL_RECEIVERS
+    keywords = tenant.keywords if tenant else KEYWORDS
+    keyword_colors = tenant.colors if tenant else KEYWORD_COLORS
+    if not EMAIL_USER or not EMAIL_PASSWORD or not receivers: 
+        print("[INFO] 이메일 설정 없음, 발송 건너뜀")
+        return None
+    if df_new.empty: 
+        return None
+
+    subject = f"[뉴스리포트] {target_date_str} 주요 뉴스 알림"
+    trend_stats = None
+    if TREND_WEEKS and getattr(tenant, "stats", None) is not None:
+        # 오늘 기사는 발송 후에 집계에 더해지므로 이력 집계와 합쳐서 보여줌
+        since = (pd.Timestamp(target_date_str) - pd.Timedelta(weeks=TREND_WEEKS)).strftime("%Y-%m-%d")
+        trend_stats = pd.concat([tenant.stats.read(since), DailyStats.rollup(df_new)], ignore_index=True)
+    digests = build_digests(df_new.to_dict("records"), keywords, keyword_colors, receivers, target_date_str,
+                            trend_stats)
+    messages = []
+    for html_body, addrs in digests:
         msg = MIMEMultipart()
         msg['Subject'] = subject
         msg['From'] = EMAIL_USER
-        msg['To'] = ", ".join(receivers) 
         msg.attach(MIMEText(html_body, 'html'))
+        for addr in addrs:
+            del msg['To']
+            msg['To'] = addr
+            messages.append((addr, msg.as_string()))
+    if not messages:
+        print("[INFO] 구독 키워드에 맞는 기사가 없어 발송할 리포트가 없습니다")
+        return None
 
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            server.starttls()
-            server.login(EMAIL_USER, EMAIL_PASSWORD)
-            server.sendmail(EMAIL_USER, receivers, msg.as_string())
-            
-        print(f"[OK] 이메일 발송 성공 (수신자: {len(receivers)}명)")
-    except Exception as e:
-        print(f"[ERROR] 이메일 발송 실패: {e}")
+    sent = send_messages(messages)
+    METRICS.count("emails_sent", sent)
+    if sent:
+        print(f"[OK] 이메일 발송 성공 (수신자: {sent}/{len(messages)}명, 리포트 {len(digests)}종)")
+    return sent
+
+# ============== 기사 처리 파이프라인 ==============
+_STREAM_END = object()
+
+def article_keywords(row):
+    """기사가 검색된 모든 키워드 (첫 번째가 대표 키워드)"""
+    return row.get("_keywords") or [row["키워드"]]
+
+def merge_keywords(target, row):
+    """같은 기사로 판정된 row의 키워드를 target에 합침"""
+    keywords = article_keywords(target)
+    target["_keywords"] = keywords + [kw for kw in article_keywords(row) if kw not in keywords]
+
+def accept_decoded_row(row, decoded, known_urls, seen_urls):
+    """변환된 실제 URL 기준 중복이면 False, 아니면 실제링크/출처를 채우고 True
+
+    seen_urls는 이번 실행의 {실제 URL: 기사}이며, 이번 실행에서 이미 처리 중인 기사와 같으면
+    키워드만 그 기사에 합치고 row["_merged_into"]에 대상 기사 키를 남깁니다.
+    """
+    if decoded in seen_urls:
+        target = seen_urls[decoded]
+        merge_keywords(target, row)
+        row["_merged_into"] = RunJournal.key(target)
+        print(f"   [병합] 같은 기사 ({', '.join(article_keywords(row))} → {target['키워드']}): {row['제목'][:30]}...")
+        return False
+    if decoded == row["원문링크"]:
+        seen_urls[decoded] = row
+        return True
+    if decoded in known_urls:
+        print(f"   [제외] 이미 수집한 기사: {row['제목'][:30]}...")
+        return False
+    seen_urls[decoded] = row
+    row["실제링크"] = decoded
+    # 실제 기사 도메인으로 출처 재판별 (RSS 출처명보다 정확)
+    domain_source = SOURCE_RESOLVER.by_domain(decoded)
+    if domain_source:
+        row["출처"] = domain_source
+        row["신뢰도"] = SOURCE_RESOLVER.scores.get(domain_source, SOURCE_RESOLVER.default_score)
+    return True
+
+def check_relevance(row, content):
+    """본문/제목에 (검색된 키워드 중 하나라도) 키워드가 있으면 row["_content"]를 채우고 True"""
+    keywords = article_keywords(row)
+    in_title = any(kw in row['제목'] for kw in keywords)
+    if content:
+        # 키워드 관련성 체크
+        if in_title or any(kw in content for kw in keywords):
+            row["_content"] = content
+            return True
+        print(f"   [제외] 본문에 '{', '.join(keywords)}' 없음: {row['제목'][:30]}...")
+        return False
+    # 본문 추출 실패해도 제목에 키워드 있으면 포함
+    if in_title:
+        row["_content"] = ""
+        return True
+    return False
+
+def summarize_rows(rows):
+    """본문이 있는 행만 (캐시/배치) 요약하여 row["요약"]에 기록"""
+    content_rows = [row for row in rows if row.get("_content")]
+    summaries = summarize_with_cache([row["_content"] for row in content_rows],
+                                     [article_keywords(row) for row in content_rows],
+                                     [row["제목"] for row in content_rows])
+    for row, summary in zip(content_rows, summaries):
+        row["요약"] = summary
+
+def run_stage(func, in_q, out_q, workers, batch_size=1, batch_wait=0.0):
+    """in_q 항목을 workers개 스레드에서 func(항목 목록)로 처리해 결과를 out_q로 전달
+
+    func는 내보낼 항목들을 반환(yield)합니다. 마지막 워커가 끝나면 out_q에 종료 표시를 넣습니다.
+    """
+    remaining = [max(1, workers)]
+    lock = threading.Lock()
+
+    def worker():
+        try:
+            done = False
+            while not done:
+                item = in_q.get()
+                if item is _STREAM_END:
+                    break
+                batch = [item]
+                while len(batch) < batch_size:
+                    try:
+                        item = in_q.get(timeout=batch_wait)
+                    except queue.Empty:
+                        break
+                    if item is _STREAM_END:
+                        done = True
+                        break
+                    batch.append(item)
+                try:
+                    for out in func(batch):
+                        out_q.put(out)
+                except Exception as e:
+                    print(f"[WARN] 파이프라인 처리 실패: {e}")
+        finally:
+            # 같은 단계의 다른 워커도 끝나도록 종료 표시를 되돌려 놓음
+            in_q.put(_STREAM_END)
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                out_q.put(_STREAM_END)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(remaining[0])]
+    for t in threads:
+        t.start()
+    return threads
+
+def run_stream_pipeline(rows, known_urls, journal=None, seen_urls=None):
+    """URL 변환 → 본문 다운로드/추출 → 관련성 체크 → 요약을 단계별 동시성으로 겹쳐 실행
+
+    관련성 체크를 통과한 기사는 다른 기사의 추출을 기다리지 않고 바로 요약 단계로 넘어갑니다.
+    반환 순서는 입력 순서와 같습니다. journal이 있으면 기사별 진행 단계를 기록합니다.
+    seen_urls({실제 URL: 기사})는 이전 실행에서 이미 처리한 기사로, 같은 기사는 키워드만 합칩니다.
+    """
+    def note(row, stage):
+        if journal is not None:
+            journal.record(row, stage)
+
+    size = STREAM_QUEUE_SIZE
+    decode_q, gate_q, extract_q, summary_q, done_q = (queue.Queue(maxsize=size) for _ in range(5))
+    deadline = time.time() + EXTRACT_DEADLINE_SEC
+    seen_urls = {} if seen_urls is None else seen_urls
+    pending = {}
+    next_index = [0]
+
+    def decode(batch):
+        for i, row in batch:
+            yield i, row, resolve_google_news_url(row["원문링크"])
+
+    def gate(batch):
+        # 실제 URL 중복 판정은 입력 순서대로 해야 결과가 단계식 처리와 같으므로 순서를 맞춰 내보냄
+        for i, row, decoded in batch:
+            pending[i] = (row, decoded)
+        while next_index[0] in pending:
+            i = next_index[0]
+            row, decoded = pending.pop(i)
+            next_index[0] += 1
+            if accept_decoded_row(row, decoded, known_urls, seen_urls):
+                yield i, row
+            else:
+                note(row, "merged" if "_merged_into" in row else "dropped")
+
+    def extract(batch):
+        for i, row in batch:
+            content = ""
+            if time.time() < deadline:
+                content = extract_article_content(row["실제링크"] or row["원문링크"], article_keywords(row), row["제목"])
+            else:
+                METRICS.count("extract_deadline_skipped")
+            if check_relevance(row, content):
+                note(row, "extracted")
+                yield i, row
+            else:
+                note(row, "dropped")
+
+    def summarize(batch):
+        for i, row in batch:
+            print(f"   [요약] [{row.get('출처', '?')}] {row['제목'][:25]}...")
+        summarize_rows([row for _, row in batch])
+        for i, row in batch:
+            note(row, "summarized")
+        yield from batch
+
+    def feed():
+        for item in enumerate(rows):
+            decode_q.put(item)
+        decode_q.put(_STREAM_END)
+
+    threading.Thread(target=feed, daemon=True).start()
+    run_stage(decode, decode_q, gate_q, DECODE_WORKERS)
+    run_stage(gate, gate_q, extract_q, 1)
+    run_stage(extract, extract_q, summary_q, EXTRACT_WORKERS)
+    batch_size = SUMMARY_BATCH_SIZE if SUMMARY_MODE == "batch" else 1
+    run_stage(summarize, summary_q, done_q, SUMMARY_WORKERS, batch_size=batch_size, batch_wait=1.0)
+
+    results = {}
+    while True:
+        item = done_q.get()
+        if item is _STREAM_END:
+            break
+        i, row = item
+        results[i] = row
+    cache = get_url_cache()
+    if cache is not None:
+        cache.evict()
+    return [results[i] for i in sorted(results)]
 
 # ============== 메인 ==============
-def main():
+# 실행 단계 (앞 단계부터 차례로 실행하며, 결과는 저널에 남아 다음 명령이 이어서 처리)
+STAGES = ("collect", "dedup", "summarize", "report")
+
+def main(until="report", dry_run=False, resume_only=False, tenants=None, backfill_range=None):
+    """파이프라인을 until 단계까지 실행 (dry_run이면 이메일 발송/저장 없이 결과만 출력)
+
+    backfill_range=(시작일, 종료일)이면 어제 대신 그 기간을 백필합니다 (run_backfill).
+    """
+    if not _configured:
+        configure()
+    METRICS.reset()
+    if HTTP_CACHE_MODE == "offline" and not dry_run:
+        # 캐시 재실행은 결과 확인용: 수집 기준점/실행 기록/이력은 바꾸지 않음
+        print("[INFO] 오프라인 재실행: --dry-run과 같이 발송/저장 없이 결과만 출력합니다")
+        dry_run = True
+    target_date_str = None
+    try:
+        if backfill_range:
+            target_date_str = run_backfill(*backfill_range, dry_run=dry_run, tenants=tenants)
+        else:
+            target_date_str = run_pipeline(until, dry_run, resume_only, tenants)
+    finally:
+        shutdown_extract_pool()
+        http_cache = get_http_cache() if HTTP_CACHE_MODE != "off" else None
+        if http_cache is not None:
+            http_cache.evict()
+        write_run_report(target_date_str)
+
+def run_pipeline(until="report", dry_run=False, resume_only=False, tenants=None):
+    """수집 → 중복 제거 → 본문 추출 → 요약 → 저장/발송 (처리한 타겟 날짜 반환)
+
+    tenants를 생략하면 config.json의 기본 테넌트(+ "tenants"에 등록한 테넌트)로 실행합니다.
+    """
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     now_kst = pd.Timestamp.now(tz="Asia/Seoul")
     yesterday_kst = now_kst - pd.Timedelta(days=1)
     target_date_str = yesterday_kst.strftime("%Y-%m-%d")
-    print(f"[INFO] 타겟 날짜: {target_date_str}")
+    print(f"[INFO] 타겟 날짜: {target_date_str}" + (" (dry-run: 발송/저장 없음)" if dry_run else ""))
 
-    all_path = DATA_DIR / "ALL.csv"
-    req_cols = ["키워드","제목","원문링크","출처","신뢰도","발행일(KST)","수집시각(KST)","요약","_title_norm"]
+    METRICS.begin_stage("load_history")
+    tenants = tenants or load_tenants(CONFIG)
+    # 오프라인 재실행은 이미 저장한 날짜도 다시 처리할 수 있도록 이력 대비 중복 제거 생략
+    for tenant in tenants:
+        tenant.load_history(dedup=HTTP_CACHE_MODE != "offline")
+    if len(tenants) > 1:
+        print(f"[INFO] 테넌트 {len(tenants)}개 ({', '.join(t.name for t in tenants)}): 수집/요약은 한 번만 진행")
+
+    # dry-run은 이전 실행 기록을 건드리지 않도록 메모리 저널 사용
+    journal = RunJournal(":memory:") if dry_run else open_run_journal(target_date_str)
+    if journal.progress:
+        print(f"[INFO] 이전 실행을 이어서 진행합니다 (완료 단계: {journal.progress})")
+    elif resume_only:
+        print("[INFO] 이어서 처리할 실행 기록이 없습니다. collect/dedup/summarize 또는 run을 먼저 실행하세요.")
+        return target_date_str
+
+    if journal.progress == "deduped":
+        print("[STEP 1~3] 이전 실행의 수집/중복 제거 결과 사용")
+    else:
+        raw_rows = collect_candidates(journal, target_date_str, dry_run, union_keywords(tenants))
+        if until == "collect":
+            print(f"[DONE] 수집 단계 완료 ({len(raw_rows)}건)")
+            return target_date_str
+        if not raw_rows or not select_candidates(journal, tenants, raw_rows):
+            journal.finish()
+            return target_date_str
+    if until in ("collect", "dedup"):
+        candidates = journal.rows("deduped", "extracted", "summarized")
+        print(f"[DONE] 중복 제거 단계 완료 (처리 대상 {len(candidates)}건)")
+        for row in candidates:
+            print(f"   [{row['키워드']}] [{row.get('출처', '?')}] {row['제목'][:40]}")
+        return target_date_str
+
+    relevant_rows = process_journal(journal, tenants)
+    if not relevant_rows:
+        print("[INFO] 관련 기사가 없습니다.")
+        journal.finish()
+        return target_date_str
+    if until == "summarize":
+        print(f"[DONE] 요약 단계 완료 ({len(relevant_rows)}건, report로 발송/저장)")
+        return target_date_str
+
+    # === 6단계: 테넌트별 저장 및 이메일 발송 (실행당 한 번) ===
+    METRICS.begin_stage("step6_save_email")
+    selections = json.loads(journal.get_meta("tenants") or "{}")
+    merged_rows = journal.rows("merged")
+    emailed = True
+    for tenant in tenants:
+        rows = tenant_rows(tenant, selections.get(tenant.name, {}), relevant_rows, merged_rows,
+                           saved=bool(journal.get_meta(f"saved:{tenant.name}")))
+        emailed &= report_tenant(journal, tenant, rows, target_date_str, dry_run, multi=len(tenants) > 1)
+    if dry_run:
+        return target_date_str
+    if not emailed:
+        print("[WARN] 이메일을 보내지 못했습니다. 실행 기록을 남겨 두었으니 `python web_news.py report`로 다시 발송하세요.")
+        return target_date_str
+    journal.finish()
+    
+    print("[DONE] 완료!")
+    return target_date_str
+
+def process_journal(journal, tenants):
+    """3.5~5단계: 저널의 선택된 기사 중 남은 것만 변환/추출/요약하고 요약된 기사 목록 반환"""
+    # 이전 실행에서 변환/추출까지 끝난 기사의 실제 URL도 같은 기사 판정에 포함
+    done_rows = journal.rows("extracted", "summarized")
+    seen_urls = {row["실제링크"] or row["원문링크"]: row for row in done_rows}
+    pending_rows = journal.rows("deduped")
+    if done_rows:
+        print(f"   이전 실행에서 처리된 기사 {len(done_rows)}건, 남은 기사 {len(pending_rows)}건")
+    METRICS.count("resumed_rows", len(done_rows))
+
+    if pending_rows:
+        # 한 테넌트라도 아직 받지 않은 기사는 처리 (테넌트별 이력 제외는 리포트 단계에서)
+        known_urls = set.intersection(*(tenant.history_index.urls for tenant in tenants))
+        process_candidates(pending_rows, known_urls, journal, seen_urls)
+
+    extracted_rows = journal.rows("extracted")
+    if extracted_rows:
+        # 추출까지만 끝나고 요약되지 못한 기사 (이전 실행 중단 또는 요약 단계 오류)
+        METRICS.begin_stage("step5_resume_summarize")
+        print(f"[STEP 5] 요약되지 않은 기사 요약 ({len(extracted_rows)}건)...")
+        summarize_rows(extracted_rows)
+        for row in extracted_rows:
+            journal.record(row, "summarized")
+
+    relevant_rows = journal.rows("summarized")
+    print(f"   관련성 체크 후 {len(relevant_rows)}건")
+    METRICS.count("relevant_rows", len(relevant_rows))
+    return relevant_rows
+
+def union_keywords(tenants):
+    """모든 테넌트의 키워드 (처음 나온 순서 유지)"""
+    keywords = []
+    for tenant in tenants:
+        keywords.extend(kw for kw in tenant.keywords if kw not in keywords)
+    return keywords
+
+def tenant_rows(tenant, selection, relevant_rows, merged_rows, saved=False):
+    """테넌트가 선택한 기사({원문링크: 키워드})를 요약 결과와 연결해 리포트 행 생성
+
+    실제 URL이 같아 다른 기사에 합쳐진 기사는 대표 기사로 연결하고, 키워드/관련성/이력은
+    테넌트 자신의 키워드와 이력 기준으로 다시 판단합니다. saved(이번 실행의 기사를 이미
+    이력에 저장함)면 이력에 든 실제 URL도 그대로 두어 발송하지 못한 메일을 다시 보냅니다.
+    """
+    by_key = {RunJournal.key(row): row for row in relevant_rows}
+    final = {row["원문링크"]: row for row in relevant_rows}
+    for row in merged_rows:
+        target = by_key.get(row.get("_merged_into"))
+        if target is not None:
+            final[row["원문링크"]] = target
+    keywords_of = {}
+    for url, keywords in selection.items():
+        target = final.get(url)
+        if target is None:
+            continue
+        merged = keywords_of.setdefault(target["원문링크"], [])
+        merged.extend(kw for kw in keywords if kw not in merged)
+
+    rows = []
+    for row in relevant_rows:
+        keywords = keywords_of.get(row["원문링크"])
+        if not keywords:
+            continue
+        content = row.get("_content") or ""
+        if not any(kw in row["제목"] or kw in content for kw in keywords):
+            continue
+        if not saved and row.get("실제링크") and row["실제링크"] in tenant.history_index.urls:
+            continue
+        row = dict(row, 키워드=keywords[0], 관련키워드=", ".join(keywords), _keywords=keywords)
+        if not row.get("요약"):
+            row["요약"] = "- 요약을 생성할 수 없습니다."
+        row.pop("_content", None)
+        rows.append(row)
+    return rows
+
+def report_tenant(journal, tenant, rows, target_date_str, dry_run=False, multi=False, daily=True):
+    """테넌트 한 곳의 이메일 발송 및 저장소/제목 색인/NEW_latest.csv 기록
+
+    daily=False(백필)면 이메일과 NEW_latest.csv 없이 저장소에 한 번에 추가만 합니다.
+    보낼 이메일을 한 통도 보내지 못했으면 False를 반환합니다 (저널을 남겨 다음 실행에서 다시 발송).
+    """
+    label = f"[{tenant.name}] " if multi else ""
+    if not rows:
+        print(f"[INFO] {label}새로 보낼 기사가 없습니다.")
+        return True
+    df_new_processed = pd.DataFrame(rows)
     
-    if all_path.exists():
-        df_existing = pd.read_csv(all_path, dtype=str, encoding="utf-8-sig")
-        for c in req_cols: 
-            if c not in df_existing.columns: 
-                df_existing[c] = ""
-        existing_titles = list(df_existing["_title_norm"].dropna().astype(str))
-        existing_urls = list(df_existing["원문링크"].dropna().astype(str))
+    if dry_run:
+        print(f"[DRY-RUN] {label}이메일 발송/저장 생략 (발송 예정 {len(rows)}건)")
+        for row in rows:
+            print(f"   [{row['관련키워드']}] [{row.get('출처', '?')}] {row['제목'][:40]}")
+        return True
+    emailed = True
+    if not daily:
+        print(f"[STEP 6] {label}이력에 {len(rows)}건 추가 (이메일 발송 없음)")
+    elif journal.get_meta(f"emailed:{tenant.name}"):
+        print(f"[STEP 6] {label}이메일은 이전 실행에서 이미 발송됨")
     else:
-        df_existing = pd.DataFrame(columns=req_cols)
-        existing_titles = []
-        existing_urls = []
+        print(f"[STEP 6] {label}이메일 발송...")
+        # 보낼 메일을 한 통도 보내지 못했으면 이어서 실행할 때 다시 발송 (보낼 메일이 없었으면 None)
+        sent = send_email_report(df_new_processed, target_date_str, tenant)
+        if sent:
+            journal.set_meta(f"emailed:{tenant.name}", "1")
+        elif sent is not None:
+            emailed = False
+    if journal.get_meta(f"saved:{tenant.name}"):
+        return emailed
+    
+    # 저장소에 새 기사만 추가
+    df_final_new = df_new_processed[ARTICLE_COLS]
+    tenant.store.append(df_final_new, journal.run_id)
+    tenant.stats.add(df_final_new, journal.run_id)
+    journal.set_meta(f"saved:{tenant.name}", "1")
+    save_title_index(tenant.history_index, df_final_new, tenant.title_index_path)
+    if daily:
+        df_final_new[DISPLAY_COLS].to_csv(tenant.data_dir / "NEW_latest.csv", index=False, encoding="utf-8-sig")
+    if EXPORT_ALL_CSV:
+        tenant.store.export_csv(tenant.data_dir / "ALL.csv")
+    return emailed
 
+def collect_candidates(journal, target_date_str, dry_run=False, keywords=None):
+    """1단계: 키워드별 RSS 수집 (수집 결과는 저널에 collected로 기록)"""
     # === 1단계: 뉴스 수집 (구글 RSS) ===
-    print("[STEP 1] 뉴스 수집 중...")
-    raw_rows = []
-    for kw in KEYWORDS:
-        raw_rows.extend(crawl_google_news(kw, target_date_str))
-        time.sleep(0.3)
+    METRICS.begin_stage("step1_collect")
+    if journal.progress == "collected":
+        raw_rows = journal.rows("collected")
+        print(f"[STEP 1] 이전 실행의 수집 결과 사용 ({len(raw_rows)}건)")
+    else:
+        print("[STEP 1] 뉴스 수집 중...")
+        raw_rows = collect_news(keywords or KEYWORDS, target_date_str)
+        journal.record_many(raw_rows, "collected")
+        journal.progress = "collected"
+        # 수집 결과가 저널에 남으므로 이후 단계가 실패해도 기사를 잃지 않음 → 수집 기준점 바로 저장
+        if INCREMENTAL and not dry_run:
+            get_feed_state().save()
     
     if not raw_rows: 
         print(f"[INFO] {target_date_str} 날짜에 해당하는 기사가 없습니다.")
-        return
+        return []
 
     print(f"   총 {len(raw_rows)}건 수집 완료")
+    METRICS.count("raw_rows", len(raw_rows))
+    return raw_rows
+
+def select_candidates(journal, tenants, raw_rows, rank_key=None):
+    """2~3단계: 중복 제거 → 그룹화 → 신뢰도 순 선택 (선택된 기사는 저널에 deduped로 기록)
+
+    이력 대비 중복 제거와 키워드당 기사 수 제한은 테넌트별로, 그룹화는 전체 후보에 한 번만 합니다.
+    rank_key는 기사 수 제한 단위 (기본: 키워드, 백필: 키워드 + 발행일)
+    """
 
     # === 2단계: 중복 제거 (URL + 제목 유사도) ===
-    print(f"[STEP 2] 중복 제거 (URL 매칭 및 유사도 {int(SIMILARITY_THRESHOLD*100)}%)...")
+    METRICS.begin_stage("step2_dedup")
+    thresholds = sorted({int(tenant.similarity_threshold * 100) for tenant in tenants})
+    print(f"[STEP 2] 중복 제거 (URL 매칭 및 유사도 {'/'.join(f'{t}%' for t in thresholds)})...")
+    candidates = {}
+    per_tenant = []
+    for tenant in tenants:
+        keywords = set(tenant.keywords)
+        rows = dedup_rows([row.copy() for row in raw_rows if row["키워드"] in keywords],
+                          tenant.history_index, tenant.similarity_threshold)
+        per_tenant.append(rows)
+        for row in rows:
+            if row["원문링크"] in candidates:
+                merge_keywords(candidates[row["원문링크"]], row)
+            else:
+                candidates[row["원문링크"]] = dict(row, _keywords=list(row["_keywords"]))
+
+    # === 2.5단계: AI 기반 고도화 중복 제거 (LLM Grouping) ===
+    METRICS.begin_stage("step2_5_llm_group")
+    grouped = group_rows(list(candidates.values()), union_keywords(tenants))
+    kept_urls = {row["원문링크"] for row in grouped}
+
+    # === 3단계: 신뢰도 순 정렬 및 상위 N개 선택 ===
+    METRICS.begin_stage("step3_rank")
+    print(f"[STEP 3] 신뢰도 순 정렬...")
+    selections = {}
+    for tenant, rows in zip(tenants, per_tenant):
+        chosen = rank_rows([row for row in rows if row["원문링크"] in kept_urls], tenant.max_articles, rank_key)
+        selections[tenant.name] = {row["원문링크"]: article_keywords(row) for row in chosen}
+        if len(tenants) > 1:
+            print(f"   [{tenant.name}] {len(chosen)}건")
+    selected = {url for selection in selections.values() for url in selection}
+    unique_rows = rank_rows([row for row in grouped if row["원문링크"] in selected])
+    print(f"   {len(raw_rows)}건 -> 중복제거/필터 후 {len(unique_rows)}건")
+    METRICS.count("unique_rows", len(unique_rows))
+
+    if not unique_rows:
+        print("[INFO] 처리할 신규 기사가 없습니다.")
+        return []
+
+    journal.record_many(unique_rows, "deduped")
+    journal.set_meta("tenants", json.dumps(selections, ensure_ascii=False))
+    journal.progress = "deduped"
+    return unique_rows
+
+def dedup_rows(raw_rows, history_index, threshold):
+    """이력 및 이번 수집분 내 중복 제거 (다른 키워드로 검색된 같은 기사는 키워드만 합침)"""
     unique_rows = []
+    run_index = TitleIndex()
+    by_url, by_title = {}, {}
+    merged = 0
     
     for row in raw_rows:
         new_title_norm = row["_title_norm"]
         new_url = row["원문링크"]
-        is_duplicate = False
-        
-        # 1. URL 기반 중복 체크 (가장 정확)
-        if new_url in existing_urls:
-            is_duplicate = True
         
-        # 2. 제목 유사도 기반 체크 (이미 URL로 발견되지 않은 경우)
-        if not is_duplicate:
-            for exist_title in existing_titles:
-                if is_similar_title(new_title_norm, exist_title, SIMILARITY_THRESHOLD):
-                    is_duplicate = True
-                    break
-        
-        if is_duplicate: 
+        # 1. 이력(ALL.csv) 대비 URL/제목 유사도 중복 체크
+        if history_index.is_duplicate(new_title_norm, new_url, threshold):
             continue
         
-        # 3. 현재 수집된 기사 내에서 중복 체크
-        for accepted in unique_rows:
-            # URL 중복
-            if new_url == accepted["원문링크"]:
-                is_duplicate = True
-                break
-            # 제목 유사도 중복
-            if is_similar_title(new_title_norm, accepted["_title_norm"], SIMILARITY_THRESHOLD):
-                is_duplicate = True
-                break
+        # 2. 현재 수집된 기사 내에서 중복 체크 (다른 키워드로 검색된 같은 기사는 키워드만 합침)
+        if new_url in by_url:
+            merge_keywords(by_url[new_url], row)
+            merged += 1
+            continue
+        similar = run_index.find_similar(new_title_norm, threshold)
+        if similar is not None:
+            merge_keywords(by_title[similar], row)
+            merged += 1
+            continue
         
-        if not is_duplicate:
-            unique_rows.append(row)
+        row["_keywords"] = [row["키워드"]]
+        unique_rows.append(row)
+        run_index.add(new_title_norm, new_url)
+        by_url[new_url] = row
+        by_title.setdefault(new_title_norm, row)
+    if merged:
+        print(f"   같은 기사 {merged}건은 키워드만 합침")
+        METRICS.count("keyword_merged_rows", merged)
+    return unique_rows
 
-    # === 2.5단계: AI 기반 고도화 중복 제거 (LLM Grouping) ===
-    if unique_rows:
-        print(f"[STEP 2.5] AI 기반 고도화 중복 제거...")
-        final_unique_rows = []
-        # 키워드별로 묶어서 AI에게 전달 (API 효율성 및 컨택스트 유지)
-        for kw_info in CONFIG.get("keywords", []):
-            if not kw_info.get("enabled", True): continue
-            kw = kw_info["name"]
-            kw_articles = [r for r in unique_rows if r["키워드"] == kw]
-            
-            if len(kw_articles) > 1:
-                grouped = filter_unique_articles_with_llm(kw_articles)
-                final_unique_rows.extend(grouped)
-            else:
-                final_unique_rows.extend(kw_articles)
-        
-        unique_rows = final_unique_rows
+def group_rows(unique_rows, keywords):
+    """키워드별로 비슷한 기사를 묶어 대표 기사만 남김 (키워드 순서 유지)"""
+    if not unique_rows:
+        return []
+    print(f"[STEP 2.5] 유사 기사 그룹화 ({GROUPING_MODE})...")
+    # 키워드별로 묶어서 그룹화 (API 효율성 및 컨텍스트 유지)
+    groups = [[r for r in unique_rows if r["키워드"] == kw] for kw in keywords]
 
-    # === 3단계: 신뢰도 순 정렬 및 상위 N개 선택 ===
-    print(f"[STEP 3] 신뢰도 순 정렬...")
-    unique_rows = sorted(unique_rows, key=lambda x: x.get("신뢰도", 50), reverse=True)
-    
-    # 키워드당 최대 기사 수 제한
+    def group(kw_articles):
+        return group_similar_articles(kw_articles) if len(kw_articles) > 1 else kw_articles
+
+    # 요청 간격은 GEMINI_SCHEDULER가 맞추므로 키워드별 요청을 동시에 보냄 (결과는 키워드 순서 유지)
+    grouped_rows = []
+    with ThreadPoolExecutor(max_workers=max(1, GEMINI_CONCURRENCY)) as executor:
+        for grouped in executor.map(group, groups):
+            grouped_rows.extend(grouped)
+    return grouped_rows
+
+def rank_rows(rows, max_articles=None, key=None):
+    """신뢰도 순 정렬 후 키워드(또는 key(row))당 최대 max_articles건 선택"""
+    rows = sorted(rows, key=lambda x: x.get("신뢰도", 50), reverse=True)
+    if max_articles is None:
+        return rows
     keyword_count = {}
     filtered_rows = []
-    for row in unique_rows:
-        kw = row["키워드"]
+    for row in rows:
+        kw = key(row) if key else row["키워드"]
         keyword_count[kw] = keyword_count.get(kw, 0) + 1
-        if keyword_count[kw] <= MAX_ARTICLES:
+        if keyword_count[kw] <= max_articles:
             filtered_rows.append(row)
-    
-    unique_rows = filtered_rows
-    print(f"   {len(raw_rows)}건 -> 중복제거/필터 후 {len(unique_rows)}건")
+    return filtered_rows
 
-    if not unique_rows:
-        print("[INFO] 처리할 신규 기사가 없습니다.")
+# ============== 백필 ==============
+def backfill_rank_key(row):
+    """백필은 키워드당 기사 수 제한을 발행일별로 적용"""
+    return row["키워드"], str(row.get("발행일(KST)", ""))[:10]
+
+def collect_shards(journal, days, keywords):
+    """백필 1단계: (날짜, 키워드) 샤드별 RSS 수집 — 끝난 샤드는 건너뛰고 실패한 샤드 목록 반환
+
+    샤드는 RSS_WORKERS개씩 동시에 수집하되 BACKFILL_RPM 속도 제한과 429/5xx 재시도를 거칩니다.
+    샤드가 끝날 때마다 수집 결과와 완료 표시를 저널에 남겨, 중단 후 다시 실행하면 남은 샤드만 수집합니다.
+    """
+    shards = [(day, kw) for day in days for kw in keywords]
+    pending = [(day, kw) for day, kw in shards if journal.get_meta(f"shard:{day}|{kw}") is None]
+    print(f"[STEP 1] 샤드 {len(shards)}개 중 {len(pending)}개 수집 (완료된 {len(shards) - len(pending)}개 건너뜀)")
+    scheduler = RateScheduler(BACKFILL_RPM, breaker_threshold=10)
+    failed = []
+
+    def run(shard):
+        day, kw = shard
+        try:
+            rows = scheduler.call(lambda: crawl_google_news(kw, day, date_bounded=True, raise_errors=True,
+                                                            strip=keywords))
+        except Exception as e:
+            print(f"[WARN] 샤드 {day} [{kw}] 수집 실패: {e}")
+            METRICS.failure("collect_shards")
+            failed.append(shard)
+            return
+        journal.record_many(rows, "collected")
+        journal.set_meta(f"shard:{day}|{kw}", str(len(rows)))
+        METRICS.count("backfill_shards")
+
+    with ThreadPoolExecutor(max_workers=max(1, RSS_WORKERS)) as executor:
+        list(executor.map(run, pending))
+    return failed
+
+def run_backfill(start_date, end_date, dry_run=False, tenants=None):
+    """start_date ~ end_date 기간을 날짜/키워드 샤드로 나눠 수집하고 이력에 한 번에 추가 (이메일 없음)
+
+    진행 상황은 data/journal/run_backfill_<시작>_<끝>.sqlite3에 남아, 같은 기간으로 다시 실행하면
+    끝난 샤드/기사는 건너뛰고 이어서 처리합니다.
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    days = [day.strftime("%Y-%m-%d") for day in pd.date_range(start_date, end_date, freq="D")]
+    range_str = f"{start_date}~{end_date}"
+    print(f"[INFO] 백필 기간: {range_str} ({len(days)}일)" + (" (dry-run: 저장 없음)" if dry_run else ""))
+    if not days:
+        print("[WARN] 백필 기간이 비어 있습니다 (시작일이 종료일보다 늦음)")
+        return range_str
+
+    METRICS.begin_stage("load_history")
+    tenants = tenants or load_tenants(CONFIG)
+    for tenant in tenants:
+        tenant.load_history(dedup=HTTP_CACHE_MODE != "offline")
+    keywords = union_keywords(tenants)
+
+    journal = RunJournal(":memory:") if dry_run else open_run_journal(f"backfill_{start_date}_{end_date}")
+    if journal.progress == "deduped":
+        print("[STEP 1~3] 이전 실행의 수집/중복 제거 결과 사용")
+    else:
+        METRICS.begin_stage("step1_collect_shards")
+        failed = collect_shards(journal, days, keywords)
+        if failed:
+            print(f"[WARN] 샤드 {len(failed)}개 수집 실패: 같은 명령을 다시 실행하면 실패한 샤드만 다시 수집합니다.")
+            return range_str
+        # 발행 순서대로 (같은 기사가 여러 날짜 검색에 걸리면 먼저 나온 것을 대표로)
+        raw_rows = sorted(journal.rows("collected"),
+                          key=lambda row: (str(row.get("발행일(KST)", "")), keywords.index(row["키워드"])
+                                           if row["키워드"] in keywords else len(keywords)))
+        print(f"   총 {len(raw_rows)}건 수집 완료")
+        METRICS.count("raw_rows", len(raw_rows))
+        if not raw_rows or not select_candidates(journal, tenants, raw_rows, rank_key=backfill_rank_key):
+            journal.finish()
+            return range_str
+
+    relevant_rows = process_journal(journal, tenants)
+    if relevant_rows:
+        # === 6단계: 테넌트별 이력에 한 번에 추가 (이메일 발송 없음) ===
+        METRICS.begin_stage("step6_save")
+        selections = json.loads(journal.get_meta("tenants") or "{}")
+        merged_rows = journal.rows("merged")
+        for tenant in tenants:
+            rows = tenant_rows(tenant, selections.get(tenant.name, {}), relevant_rows, merged_rows)
+            report_tenant(journal, tenant, rows, range_str, dry_run, multi=len(tenants) > 1, daily=False)
+    if not dry_run:
+        journal.finish()
+    print("[DONE] 백필 완료!")
+    return range_str
+
+def process_candidates(rows, known_urls, journal, seen_urls=None):
+    """3.5~5단계: URL 변환 → 본문 추출 → 관련성 체크 → 요약 (기사별 진행 단계를 저널에 기록)"""
+    if PIPELINE_MODE == "streaming":
+        # === 3.5~5단계: URL 변환 → 본문 추출 → 관련성 체크 → 요약 (스트리밍) ===
+        METRICS.begin_stage("step3_5_to_5_stream")
+        print(f"[STEP 3.5~5] URL 변환/본문 추출/요약 동시 진행 ({len(rows)}건)...")
+        run_stream_pipeline(rows, known_urls, journal, seen_urls)
+        report_prefilter()
         return
 
+    # === 3.5단계: 구글 뉴스 URL 일괄 변환 + 실제 URL 기준 중복 제거 ===
+    METRICS.begin_stage("step3_5_decode")
+    print(f"[STEP 3.5] 기사 URL 변환 ({len(rows)}건)...")
+    decoded_urls = resolve_google_news_urls([row["원문링크"] for row in rows])
+    seen_urls = {} if seen_urls is None else seen_urls
+    unique_rows = []
+    for row, decoded in zip(rows, decoded_urls):
+        if accept_decoded_row(row, decoded, known_urls, seen_urls):
+            unique_rows.append(row)
+        else:
+            journal.record(row, "merged" if "_merged_into" in row else "dropped")
+
     # === 4단계: 본문 추출 + 키워드 관련성 체크 ===
+    METRICS.begin_stage("step4_extract")
     print(f"[STEP 4] 본문 추출 및 관련성 체크...")
+    contents = extract_articles([row["실제링크"] or row["원문링크"] for row in unique_rows],
+                                keywords=[article_keywords(row) for row in unique_rows],
+                                titles=[row["제목"] for row in unique_rows])
+    report_prefilter()
     relevant_rows = []
-    for row in unique_rows:
-        keyword = row["키워드"]
-        content = extract_article_content(row["원문링크"])
-        
-        if content:
-            # 키워드 관련성 체크
-            if keyword in content or keyword in row['제목']:
-                row["_content"] = content
-                relevant_rows.append(row)
-            else:
-                print(f"   [제외] 본문에 '{keyword}' 없음: {row['제목'][:30]}...")
+    for row, content in zip(unique_rows, contents):
+        if check_relevance(row, content):
+            relevant_rows.append(row)
+            journal.record(row, "extracted")
         else:
-            # 본문 추출 실패해도 제목에 키워드 있으면 포함
-            if keyword in row['제목']:
-                row["_content"] = ""
-                relevant_rows.append(row)
-    
-    print(f"   관련성 체크 후 {len(relevant_rows)}건")
-
+            journal.record(row, "dropped")
     if not relevant_rows:
-        print("[INFO] 관련 기사가 없습니다.")
         return
 
     # === 5단계: AI 요약 (최종 필터된 기사만) ===
+    METRICS.begin_stage("step5_summarize")
     print(f"[STEP 5] AI 요약 생성 중 ({len(relevant_rows)}건)...")
-    processed_rows = []
     for i, row in enumerate(relevant_rows):
         print(f"   ({i+1}/{len(relevant_rows)}) [{row.get('출처', '?')}] {row['제목'][:25]}...")
-        
-        content = row.get("_content", "")
-        summary = ""
-        
-        if content:
-            summary = summarize_article(content)
-            time.sleep(6)  # Gemini API Rate Limit (분당 10 요청)
-        
-        if not summary:
-            summary = "- 요약을 생성할 수 없습니다."
-            
-        row["요약"] = summary
-        if "_content" in row:
-            del row["_content"]
-        processed_rows.append(row)
+    summarize_rows(relevant_rows)
+    for row in relevant_rows:
+        journal.record(row, "summarized")
 
-    # === 6단계: 저장 및 이메일 발송 ===
-    if processed_rows:
-        df_new_processed = pd.DataFrame(processed_rows)
-        
-        print(f"[STEP 6] 이메일 발송...")
-        send_email_report(df_new_processed, target_date_str)
-        
-        # CSV 저장
-        df_final_new = df_new_processed[req_cols]
-        combined = pd.concat([df_existing, df_final_new], ignore_index=True)
-        combined = combined.drop_duplicates(subset=["_title_norm"], keep="last")
-        combined = combined.sort_values("수집시각(KST)", ascending=False)
-
-        display_cols = ["키워드","제목","출처","요약","원문링크","발행일(KST)","수집시각(KST)","_title_norm"]
-        combined[display_cols].to_csv(DATA_DIR / "ALL.csv", index=False, encoding="utf-8-sig")
-        df_final_new[display_cols].to_csv(DATA_DIR / "NEW_latest.csv", index=False, encoding="utf-8-sig")
-        
-        print("[DONE] 완료!")
+def print_stats(tenant, weeks):
+    """키워드별 주간 기사 수, 주요 출처, 신뢰도 분포 출력"""
+    stats_df = tenant.stats.read()
+    trend = weekly_trend(stats_df, tenant.keywords, weeks)
+    if trend.empty:
+        print("[INFO] 집계된 기사가 없습니다.")
+        return
+    print(f"[STATS] 최근 {len(trend)}주 키워드별 기사 수")
+    print(trend.to_string())
+    since = (pd.Timestamp(stats_df["date"].max()) - pd.Timedelta(weeks=weeks)).strftime("%Y-%m-%d")
+    recent = stats_df[stats_df["date"] > since]
+    print("\n[STATS] 주요 출처 (기사 수, 평균 신뢰도)")
+    print(top_sources(recent, 10).to_string())
+    print("\n[STATS] 신뢰도 분포")
+    for label, count in score_distribution(recent).items():
+        print(f"   {label}: {count}건")
+
+def parse_date(text):
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"날짜 형식이 잘못되었습니다 (YYYY-MM-DD): {text}")
+
+def parse_args(argv=None):
+    # 공통 옵션은 서브커맨드 앞/뒤 어디에 써도 되도록 양쪽에 등록 (지정하지 않으면 값을 덮어쓰지 않음)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default=argparse.SUPPRESS, help="설정 파일 경로 (기본값: config.json)")
+    common.add_argument("--keywords", nargs="+", default=argparse.SUPPRESS,
+                        help="이번 실행에서 수집할 키워드 (config.json 키워드 목록 대신 사용)")
+    common.add_argument("--tenants", nargs="+", default=argparse.SUPPRESS, metavar="CONFIG",
+                        help="함께 실행할 다른 팀의 설정 파일 (config.json의 tenants 대신 사용, 이력은 data/tenants/<파일명>/)")
+    common.add_argument("--dry-run", action="store_true", default=argparse.SUPPRESS,
+                        help="이메일 발송/저장 없이 결과만 출력 (이전 실행 기록도 건드리지 않음)")
+    common.add_argument("--offline", action="store_true", default=argparse.SUPPRESS,
+                        help="네트워크 없이 HTTP 응답 캐시/요약 캐시만으로 재실행 (--dry-run처럼 발송/저장 없음, 이력 대비 중복 제거 생략)")
+
+    parser = argparse.ArgumentParser(description="구글 뉴스 키워드 요약 리포트", parents=[common])
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("collect", parents=[common], help="1단계: RSS 수집까지 실행")
+    sub.add_parser("dedup", parents=[common], help="1~3단계: 중복 제거/그룹화/선택까지 실행")
+    sub.add_parser("summarize", parents=[common], help="1~5단계: 본문 추출/요약까지 실행")
+    sub.add_parser("report", parents=[common], help="이전 단계 결과로 이메일 발송 및 저장")
+    sub.add_parser("run", parents=[common], help="수집부터 이메일 발송까지 실행 (기본값)")
+    backfill = sub.add_parser("backfill", parents=[common], help="지난 기간을 날짜/키워드별로 수집해 이력에 추가 (이메일 없음)")
+    backfill.add_argument("--from", dest="start_date", type=parse_date, required=True, help="시작일 (YYYY-MM-DD)")
+    backfill.add_argument("--to", dest="end_date", type=parse_date, required=True, help="종료일 (YYYY-MM-DD, 포함)")
+    export = sub.add_parser("export", parents=[common], help="저장소를 ALL.csv로 내보내기")
+    export.add_argument("--output", default=str(DATA_DIR / "ALL.csv"))
+    compact = sub.add_parser("compact", parents=[common], help="저장소 중복 정리 및 오래된 파티션 삭제")
+    compact.add_argument("--retention-months", type=int, default=None,
+                         help="이 개월 수보다 오래된 월 파티션 삭제")
+    sub.add_parser("rebuild-stats", parents=[common], help="저장소 이력에서 일별 집계를 다시 계산")
+    sub.add_parser("renormalize", parents=[common], help="정규화 규칙 변경 후 이력 전체의 비교용 제목(_title_norm)과 제목 색인 재계산")
+    stats = sub.add_parser("stats", parents=[common], help="일별 집계로 키워드별 주간 추이/주요 출처 출력")
+    stats.add_argument("--weeks", type=int, default=None, help="조회할 주 수 (기본값: trend_weeks 설정)")
+    args = parser.parse_args(argv)
+    for name, default in (("config", None), ("keywords", None), ("tenants", None),
+                          ("dry_run", False), ("offline", False)):
+        if not hasattr(args, name):
+            setattr(args, name, default)
+    return args
+
+def cli(argv=None):
+    global HTTP_CACHE_MODE
+    args = parse_args(argv)
+    configure(args.config, args.keywords)
+    if args.offline:
+        HTTP_CACHE_MODE = "offline"
+    if args.command == "export":
+        count = get_article_store().export_csv(Path(args.output))
+        print(f"[DONE] {args.output} 내보내기 완료 ({count}건)")
+        return
+    if args.command == "compact":
+        store = get_article_store()
+        removed_partitions, removed_rows = store.compact(args.retention_months)
+        # 삭제/정리된 행이 집계에 남지 않도록 다시 계산
+        get_daily_stats(store, DATA_DIR).rebuild(store)
+        print(f"[DONE] 파티션 {removed_partitions}개, 중복 행 {removed_rows}건 정리")
+        return
+    if args.command == "renormalize":
+        tenants = load_tenants(CONFIG, args.tenants)
+        # 수집 때와 같이 모든 테넌트의 키워드를 제목에서 제거
+        keywords = union_keywords(tenants)
+        for tenant in tenants:
+            tenant.data_dir.mkdir(parents=True, exist_ok=True)
+            store = get_article_store(tenant.data_dir)
+            total, changed = store.renormalize(keywords)
+            # 제목 색인은 정규화된 제목으로 만들어지므로 처음부터 다시 구축
+            history = store.read(DEDUP_COLS)
+            TitleIndex.build(list(history["_title_norm"].dropna().astype(str)),
+                             history_urls(history)).save(tenant.title_index_path)
+            print(f"[DONE] [{tenant.name}] 제목 정규화 {total}건 중 {changed}건 변경, 제목 색인 재구축")
+        return
+    if args.command == "rebuild-stats":
+        for tenant in load_tenants(CONFIG, args.tenants):
+            tenant.data_dir.mkdir(parents=True, exist_ok=True)
+            store = get_article_store(tenant.data_dir)
+            count = DailyStats(tenant.data_dir / STATS_PATH.name).rebuild(store)
+            print(f"[DONE] [{tenant.name}] 일별 집계 {count}행 재계산")
+        return
+    if args.command == "stats":
+        tenant = Tenant.default()
+        # 추이 조회는 일별 집계만 읽음 (이력 전체/제목 색인은 불러오지 않음)
+        tenant.stats = get_daily_stats(get_article_store(tenant.data_dir), tenant.data_dir)
+        print_stats(tenant, args.weeks or TREND_WEEKS or 4)
+        return
+    tenants = load_tenants(CONFIG, args.tenants) if args.tenants else None
+    if args.keywords and not args.tenants:
+        # 키워드를 직접 지정하면 그 키워드만 수집 (config.json의 다른 테넌트는 제외)
+        tenants = [Tenant.default()]
+    if args.command in ("collect", "dedup", "summarize"):
+        main(until=args.command, dry_run=args.dry_run, tenants=tenants)
+    elif args.command == "report":
+        main(until="report", dry_run=args.dry_run, resume_only=True, tenants=tenants)
+    elif args.command == "backfill":
+        main(dry_run=args.dry_run, tenants=tenants, backfill_range=(args.start_date, args.end_date))
     else:
-        print("[INFO] 처리할 기사가 없습니다.")
+        main(dry_run=args.dry_run, tenants=tenants)
 
 if __name__ == "__main__":
-    main()
+    cli()